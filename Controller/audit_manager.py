@@ -16,6 +16,7 @@ from typing import Any
 
 from Controller.logger import get_logger
 from Controller.schema_validator import SchemaValidationError, validate_audit
+from Controller.state_store import write_all
 
 
 class AuditManagerError(Exception):
@@ -75,7 +76,7 @@ class AuditManager:
                 0o644,
             )
             try:
-                os.write(fd, line.encode("utf-8"))
+                write_all(fd, line.encode("utf-8"))
                 os.fsync(fd)
             finally:
                 os.close(fd)
@@ -2,6 +2,7 @@
 
 Tracks which resources are currently being modified and by which agent.
 State is persisted as JSON in Controller/state/resource_state.json.
+Pass ``persistent=False`` to keep state in memory only (no disk I/O).
 """
 from __future__ import annotations
 
@@ -9,7 +10,7 @@ import json
 from dataclasses import asdict, dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable
 
 from Controller.logger import get_logger
 
@@ -27,12 +28,34 @@ class ResourceStateEntry:
 class ResourceStateManager:
     """Track resource modification state for conflict detection."""
 
-    def __init__(self, state_file: Path, controller_id: str = "controller-01") -> None:
+    def __init__(
+        self,
+        state_file: Path,
+        controller_id: str = "controller-01",
+        persistent: bool = True,
+    ) -> None:
         self._state_file = state_file
         self._controller_id = controller_id
+        self._persistent = persistent
         self.log = get_logger(f"{controller_id}.resource_state")
         self._state: dict[str, ResourceStateEntry] = {}
-        self.load_state()
+        if persistent:
+            self.load_state()
+
+    @classmethod
+    def from_dict(
+        cls,
+        entries: dict[str, ResourceStateEntry],
+        state_file: Path,
+        controller_id: str = "controller-01",
+    ) -> ResourceStateManager:
+        """Build an in-memory manager pre-populated with *entries*.
+
+        The returned manager never reads or writes *state_file*.
+        """
+        mgr = cls(state_file, controller_id=controller_id, persistent=False)
+        mgr._state = dict(entries)
+        return mgr
 
     # ------------------------------------------------------------------
     # Persistence
@@ -45,17 +68,20 @@ class ResourceStateManager:
             return
         try:
             raw = json.loads(self._state_file.read_text(encoding="utf-8"))
-            self._state = {}
-            for rid, entry_data in raw.items():
-                if rid.startswith("_"):
-                    continue  # skip metadata keys like _meta
-                self._state[rid] = ResourceStateEntry(**entry_data)
+            # skip metadata keys like _meta
+            self._state = {
+                rid: ResourceStateEntry(**entry_data)
+                for rid, entry_data in raw.items()
+                if not rid.startswith("_")
+            }
         except (json.JSONDecodeError, OSError, TypeError) as exc:
             self.log.error("Failed to load resource state: %s", exc)
             self._state = {}
 
     def save_state(self) -> None:
-        """Atomically write resource state to disk."""
+        """Atomically write resource state to disk (no-op if not persistent)."""
+        if not self._persistent:
+            return
         self._state_file.parent.mkdir(parents=True, exist_ok=True)
         data: dict[str, Any] = {
             "_meta": {
@@ -88,6 +114,22 @@ class ResourceStateManager:
         )
         self.save_state()
 
+    def mark_modifying_many(
+        self, resource_ids: Iterable[str], agent_id: str
+    ) -> None:
+        """Mark several resources as modified by *agent_id* with one save."""
+        now = datetime.now(timezone.utc).isoformat()
+        self._state.update(
+            (rid, ResourceStateEntry(
+                resource_id=rid,
+                modifying=True,
+                modified_by=agent_id,
+                timestamp=now,
+            ))
+            for rid in resource_ids
+        )
+        self.save_state()
+
     def mark_idle(self, resource_id: str) -> None:
         """Mark a resource as no longer being modified."""
         entry = self._state.get(resource_id)
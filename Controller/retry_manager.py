@@ -9,7 +9,7 @@ import json
 from dataclasses import dataclass, asdict
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from Controller.config import ControllerConfig
 from Controller.controller_report_generator import generate_directive, write_directive
@@ -29,11 +29,24 @@ class TaskRetryEntry:
     status: str = "pending"  # pending | retrying | exhausted
 
 
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
 class RetryManager:
-    """Manage retry logic and escalation for failed agent tasks."""
+    """Manage retry logic and escalation for failed agent tasks.
+
+    *time_provider* returns the current (timezone-aware) time; override it
+    to make backoff and staleness decisions independent of the wall clock.
+    """
 
-    def __init__(self, config: ControllerConfig) -> None:
+    def __init__(
+        self,
+        config: ControllerConfig,
+        time_provider: Callable[[], datetime] = _utc_now,
+    ) -> None:
         self.config = config
+        self._time_provider = time_provider
         self.log = get_logger(f"{config.controller_id}.retry")
         self._state: dict[str, TaskRetryEntry] = {}
         self.load_state()
@@ -94,9 +107,7 @@ class RetryManager:
         if entry.last_retry_ts:
             try:
                 last_ts = datetime.fromisoformat(entry.last_retry_ts)
-                elapsed = (
-                    datetime.now(timezone.utc) - last_ts
-                ).total_seconds()
+                elapsed = (self._time_provider() - last_ts).total_seconds()
                 backoff = self.config.retry_backoff_base ** entry.retry_count
                 if elapsed < backoff:
                     return False
@@ -109,7 +120,7 @@ class RetryManager:
         self, task_id: str, agent: str, team: str
     ) -> TaskRetryEntry:
         """Record a task failure, incrementing the retry counter."""
-        now = datetime.now(timezone.utc).isoformat()
+        now = self._time_provider().isoformat()
 
         if task_id in self._state:
             entry = self._state[task_id]
@@ -186,7 +197,7 @@ class RetryManager:
         self, directive: dict[str, Any], entry: TaskRetryEntry
     ) -> Path:
         """Write a retry directive to the agent's outbox."""
-        ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        ts = self._time_provider().strftime("%Y%m%dT%H%M%SZ")
         path = (
             self.config.outbox_dir
             / entry.team
@@ -200,7 +211,7 @@ class RetryManager:
         self, directive: dict[str, Any], entry: TaskRetryEntry
     ) -> Path:
         """Write an escalation directive to the escalation outbox."""
-        ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+        ts = self._time_provider().strftime("%Y%m%dT%H%M%SZ")
         path = (
             self.config.outbox_dir
             / "escalation"
@@ -215,7 +226,7 @@ class RetryManager:
 
     def cleanup_stale_entries(self, max_age_hours: int = 72) -> int:
         """Remove retry entries older than max_age_hours. Returns count removed."""
-        now = datetime.now(timezone.utc)
+        now = self._time_provider()
         stale: list[str] = []
 
         for task_id, entry in self._state.items():
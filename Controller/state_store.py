@@ -4,6 +4,10 @@ Provides safe JSON read/write with atomic operations to prevent file
 corruption on crashes or concurrent access.
 
 All write operations use a write-to-temp + atomic-replace pattern.
+
+Set ``CONTROLLER_ATOMIC_WRITE_SKIP_FSYNC`` to ``1``, ``true`` or ``yes`` to
+skip the fsync step (e.g. in test runs where durability is irrelevant);
+the atomic replace is kept.  Any other value, including ``0``, keeps it.
 """
 from __future__ import annotations
 
@@ -11,24 +15,57 @@ import json
 import os
 import tempfile
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable
 
 from Controller.logger import get_logger
 
+_orjson_dumps: Callable[[Any], bytes] | None
+try:
+    from orjson import dumps as _orjson_dumps
+except ImportError:  # pragma: no cover - depends on environment
+    _orjson_dumps = None
+
 _log = get_logger("state_store")
 
+_SKIP_FSYNC_ENV = "CONTROLLER_ATOMIC_WRITE_SKIP_FSYNC"
+_TRUTHY = frozenset({"1", "true", "yes"})
+
 
 class StateStoreError(Exception):
     """Raised when a state store operation fails."""
 
 
-def save_json(path: Path, data: Any) -> None:
-    """Write *data* as formatted JSON to *path*.
+def write_all(fd: int, data: bytes) -> None:
+    """``os.write`` until all of *data* is written (writes may be partial)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _skip_fsync() -> bool:
+    """Whether ``CONTROLLER_ATOMIC_WRITE_SKIP_FSYNC`` asks to skip fsync."""
+    value = os.environ.get(_SKIP_FSYNC_ENV, "")
+    return value.strip().lower() in _TRUTHY
+
+
+def save_json(path: Path, data: Any, pretty: bool = True) -> None:
+    """Write *data* as JSON to *path* (indented unless *pretty* is False).
 
     Creates parent directories if they don't exist.
     Uses atomic_write internally to prevent corruption.
     """
-    atomic_write(path, data)
+    atomic_write(path, data, pretty=pretty)
+
+
+def _encode_json(data: Any, pretty: bool) -> bytes:
+    """Encode *data* as UTF-8 JSON; compact output uses orjson if installed."""
+    if pretty:
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    if _orjson_dumps is not None:
+        return _orjson_dumps(data)
+    return json.dumps(
+        data, ensure_ascii=False, separators=(",", ":")
+    ).encode("utf-8")
 
 
 def load_json(path: Path, default: Any = None) -> Any:
@@ -47,13 +84,40 @@ def load_json(path: Path, default: Any = None) -> Any:
         return default
 
 
-def atomic_write(path: Path, data: Any) -> None:
+def append_jsonl(path: Path, record: Any) -> None:
+    """Append *record* to *path* as a single JSON line.
+
+    One ``O_APPEND`` write per record, fsync'd unless
+    ``CONTROLLER_ATOMIC_WRITE_SKIP_FSYNC`` is enabled.  Creates parent
+    directories if they don't exist.
+
+    Raises StateStoreError on failure.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = json.dumps(record, ensure_ascii=False) + "\n"
+    try:
+        fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        try:
+            write_all(fd, line.encode("utf-8"))
+            if not _skip_fsync():
+                os.fsync(fd)
+        finally:
+            os.close(fd)
+    except OSError as exc:
+        raise StateStoreError(f"Append to {path} failed: {exc}") from exc
+
+
+def atomic_write(path: Path, data: Any, pretty: bool = True) -> None:
     """Write *data* as JSON atomically using a temp-file + replace pattern.
 
+    With ``pretty=False`` the JSON is compact and encoded with orjson when
+    it is installed (stdlib ``json`` otherwise).
+
     Steps:
         1. Create parent directories.
         2. Write to a temporary file in the same directory.
-        3. Flush and fsync the temporary file.
+        3. Flush and fsync the temporary file (unless
+           ``CONTROLLER_ATOMIC_WRITE_SKIP_FSYNC`` is enabled).
         4. Atomically replace the target file.
 
     This guarantees that *path* always contains either the old or the new
@@ -62,7 +126,7 @@ def atomic_write(path: Path, data: Any) -> None:
     Raises StateStoreError on failure.
     """
     path.parent.mkdir(parents=True, exist_ok=True)
-    content = json.dumps(data, indent=2, ensure_ascii=False)
+    content = _encode_json(data, pretty)
 
     fd = -1
     tmp_path = ""
@@ -72,8 +136,9 @@ def atomic_write(path: Path, data: Any) -> None:
             prefix=f".{path.stem}_",
             suffix=".tmp",
         )
-        os.write(fd, content.encode("utf-8"))
-        os.fsync(fd)
+        write_all(fd, content)
+        if not _skip_fsync():
+            os.fsync(fd)
         os.close(fd)
         fd = -1
 
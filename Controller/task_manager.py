@@ -1,8 +1,10 @@
 """Task lifecycle manager for the Controller.
 
 Creates, tracks, and transitions tasks through a well-defined state machine.
-All state is persisted to Controller/state/tasks.json via the state_store
-module.
+State is persisted via the state_store module as an append-only journal
+(Controller/state/tasks.jsonl, one record per mutation) plus a compacted
+snapshot (Controller/state/tasks.json) rewritten every ``compact_every``
+mutations.  Loading reads the snapshot and replays the journal.
 
 Task states:
     PENDING -> ASSIGNED -> RUNNING -> COMPLETED
@@ -12,6 +14,8 @@ Task states:
 """
 from __future__ import annotations
 
+import json
+import os
 import uuid
 from datetime import datetime, timezone
 from pathlib import Path
@@ -19,7 +23,7 @@ from typing import Any
 
 from Controller.logger import get_logger
 from Controller.schema_validator import SchemaValidationError, validate_task
-from Controller.state_store import load_json, save_json
+from Controller.state_store import append_jsonl, load_json, save_json
 
 # ---------------------------------------------------------------------------
 # Valid states and transitions
@@ -47,8 +51,17 @@ _VALID_TRANSITIONS: dict[str, frozenset[str]] = {
     "COMPLETED": frozenset(),
 }
 
+# Flattened (from, to) pairs: one hash probe per transition check.  Terminal
+# states have no outgoing pairs.
+_VALID_PAIRS: frozenset[tuple[str, str]] = frozenset(
+    (src, dst) for src, dsts in _VALID_TRANSITIONS.items() for dst in dsts
+)
+
 MAX_RETRIES = 3
 
+# Journal records between snapshot rewrites.
+DEFAULT_COMPACT_EVERY = 1000
+
 
 # ---------------------------------------------------------------------------
 # Exceptions
@@ -77,10 +90,24 @@ class MaxRetriesExceededError(TaskManagerError):
 
 
 class TaskManager:
-    """Deterministic task lifecycle manager with JSON persistence."""
+    """Deterministic task lifecycle manager with JSON persistence.
+
+    *tasks_file* is the snapshot; the journal lives next to it with a
+    ``.jsonl`` suffix.  Snapshots are compact JSON (orjson when installed);
+    pass ``pretty_snapshot=True`` for an indented, human-readable file.
+    """
 
-    def __init__(self, tasks_file: Path) -> None:
+    def __init__(
+        self,
+        tasks_file: Path,
+        compact_every: int = DEFAULT_COMPACT_EVERY,
+        pretty_snapshot: bool = False,
+    ) -> None:
         self._tasks_file = tasks_file
+        self._journal_file = tasks_file.with_suffix(".jsonl")
+        self._compact_every = compact_every
+        self._pretty_snapshot = pretty_snapshot
+        self._journal_len = 0
         self._log = get_logger("task_manager")
         self._tasks: dict[str, dict[str, Any]] = {}
         self._load()
@@ -118,7 +145,7 @@ class TaskManager:
 
         validate_task(task)
         self._tasks[task_id] = task
-        self._persist()
+        self._record({"op": "create", "task": task})
         self._log.info(
             "Task created: %s (type=%s)", task_id, task_type
         )
@@ -145,16 +172,19 @@ class TaskManager:
                 f"Invalid status '{status}'. Valid: {sorted(VALID_STATUSES)}"
             )
 
-        allowed = _VALID_TRANSITIONS.get(current, frozenset())
-        if status not in allowed:
+        if (current, status) not in _VALID_PAIRS:
+            allowed = _VALID_TRANSITIONS.get(current, frozenset())
             raise InvalidTransitionError(
                 f"Cannot transition {task_id} from {current} to {status}. "
                 f"Allowed: {sorted(allowed)}"
             )
 
-        task["status"] = status
-        task["updated_at"] = datetime.now(timezone.utc).isoformat()
-        self._persist()
+        fields = {
+            "status": status,
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        task.update(fields)
+        self._record({"op": "update", "task_id": task_id, "fields": fields})
         self._log.info(
             "Task %s: %s -> %s", task_id, current, status
         )
@@ -191,10 +221,13 @@ class TaskManager:
                 f"Task {task_id} has reached max retries ({MAX_RETRIES})"
             )
 
-        task["retries"] += 1
-        task["status"] = "PENDING"
-        task["updated_at"] = datetime.now(timezone.utc).isoformat()
-        self._persist()
+        fields = {
+            "retries": task["retries"] + 1,
+            "status": "PENDING",
+            "updated_at": datetime.now(timezone.utc).isoformat(),
+        }
+        task.update(fields)
+        self._record({"op": "update", "task_id": task_id, "fields": fields})
         self._log.info(
             "Task %s retried (attempt %d/%d)",
             task_id, task["retries"], MAX_RETRIES,
@@ -205,25 +238,81 @@ class TaskManager:
     # ------------------------------------------------------------------
 
     def _load(self) -> None:
-        """Load tasks from disk."""
+        """Load the snapshot from disk, then replay the journal."""
         raw = load_json(self._tasks_file, default={})
+        self._tasks = {}
         if not isinstance(raw, dict):
             self._log.warning("Invalid tasks file format, starting fresh")
-            self._tasks = {}
-            return
-
-        self._tasks = {}
-        for task_id, task_data in raw.items():
-            if not isinstance(task_data, dict):
-                continue
-            try:
-                validate_task(task_data)
-                self._tasks[task_id] = task_data
-            except SchemaValidationError as exc:
+        else:
+            for task_id, task_data in raw.items():
+                if not isinstance(task_data, dict):
+                    continue
+                try:
+                    validate_task(task_data)
+                    self._tasks[task_id] = task_data
+                except SchemaValidationError as exc:
+                    self._log.warning(
+                        "Skipping invalid task %s: %s", task_id, exc
+                    )
+        self._replay_journal()
+
+    def _replay_journal(self) -> None:
+        """Apply journal records on top of the snapshot.
+
+        Records hold absolute values, so replaying ones already folded into
+        the snapshot (crash during compaction) is harmless.  Unparseable
+        lines are skipped.  A torn final write (no trailing newline) is
+        truncated away, so the next append starts on a line of its own.
+        """
+        try:
+            data = self._journal_file.read_bytes()
+            if data and not data.endswith(b"\n"):
+                data = data[:data.rfind(b"\n") + 1]
                 self._log.warning(
-                    "Skipping invalid task %s: %s", task_id, exc
+                    "Truncating torn tail of %s", self._journal_file
                 )
+                os.truncate(self._journal_file, len(data))
+        except FileNotFoundError:
+            return
+        except OSError as exc:
+            self._log.warning("Failed to read %s: %s", self._journal_file, exc)
+            return
 
-    def _persist(self) -> None:
-        """Atomically write all tasks to disk."""
-        save_json(self._tasks_file, self._tasks)
+        for line in data.splitlines():
+            try:
+                record = json.loads(line)
+            except ValueError:  # Bad JSON or a cut multi-byte character.
+                self._log.warning("Skipping corrupt journal record")
+                continue
+            self._journal_len += 1
+            op = record.get("op") if isinstance(record, dict) else None
+            if op == "create":
+                task = record.get("task")
+                try:
+                    validate_task(task)
+                except SchemaValidationError as exc:
+                    self._log.warning("Skipping invalid journal task: %s", exc)
+                    continue
+                self._tasks[task["task_id"]] = task
+            elif op == "update":
+                task_id = record.get("task_id")
+                fields = record.get("fields")
+                if not isinstance(task_id, str) or not isinstance(fields, dict):
+                    self._log.warning("Skipping malformed journal update")
+                    continue
+                existing = self._tasks.get(task_id)
+                if existing is not None:
+                    existing.update(fields)
+
+    def _record(self, record: dict[str, Any]) -> None:
+        """Append one mutation to the journal; compact when it grows."""
+        append_jsonl(self._journal_file, record)
+        self._journal_len += 1
+        if self._journal_len >= self._compact_every:
+            self._compact()
+
+    def _compact(self) -> None:
+        """Write a full snapshot, then drop the journal it supersedes."""
+        save_json(self._tasks_file, self._tasks, pretty=self._pretty_snapshot)
+        self._journal_file.unlink(missing_ok=True)
+        self._journal_len = 0
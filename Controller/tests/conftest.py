@@ -2,6 +2,8 @@
 from __future__ import annotations
 
 import json
+import os
+from datetime import datetime, timezone, tzinfo
 from pathlib import Path
 from typing import Any
 
@@ -9,6 +11,9 @@ import pytest
 
 from Controller.config import ControllerConfig
 
+# Durability is irrelevant for tests: skip fsync in state_store.atomic_write.
+os.environ.setdefault("CONTROLLER_ATOMIC_WRITE_SKIP_FSYNC", "1")
+
 
 # ---------------------------------------------------------------------------
 # Sample data
@@ -42,6 +47,32 @@ SAMPLE_CONTROLLER_TASK: dict[str, Any] = {
 }
 
 
+FROZEN_NOW = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+# Modules whose ``datetime.now`` is pinned by the ``frozen_now`` fixture.
+_FROZEN_CLOCK_MODULES = (
+    "Controller.orchestrator_communicator",
+    "Controller.resource_state_manager",
+    "Controller.retry_manager",
+)
+
+
+class _FrozenDatetime(datetime):
+    """datetime subclass whose now() always returns FROZEN_NOW."""
+
+    @classmethod
+    def now(cls, tz: tzinfo | None = None) -> datetime:  # type: ignore[override]
+        return FROZEN_NOW if tz is not None else FROZEN_NOW.replace(tzinfo=None)
+
+
+@pytest.fixture
+def frozen_now(monkeypatch: pytest.MonkeyPatch) -> datetime:
+    """Pin ``datetime.now`` to FROZEN_NOW in the Controller state modules."""
+    for mod in _FROZEN_CLOCK_MODULES:
+        monkeypatch.setattr(f"{mod}.datetime", _FrozenDatetime)
+    return FROZEN_NOW
+
+
 @pytest.fixture
 def sample_report() -> dict[str, Any]:
     """Return a valid sample report dict."""
@@ -2,14 +2,27 @@
 from __future__ import annotations
 
 import json
+from collections.abc import Iterator
 from pathlib import Path
 
+import pytest
+
 from Controller.orchestrator_communicator import (
     Alert,
     Conflict,
     OrchestratorCommunicator,
 )
 
+pytestmark = pytest.mark.usefixtures("frozen_now")
+
+
+@pytest.fixture
+def comm(tmp_path: Path) -> Iterator[OrchestratorCommunicator]:
+    """Communicator with an (unused) outbox under tmp_path."""
+    communicator = OrchestratorCommunicator(tmp_path / "outbox")
+    yield communicator
+    communicator.clear()
+
 
 class TestAlertDataclass:
     """Test Alert dataclass."""
@@ -47,26 +60,22 @@ class TestConflictDataclass:
 class TestAddAlertAndConflict:
     """Test accumulation of alerts and conflicts."""
 
-    def test_add_alert(self, tmp_path: Path) -> None:
-        comm = OrchestratorCommunicator(tmp_path / "outbox")
+    def test_add_alert(self, comm: OrchestratorCommunicator) -> None:
         comm.add_alert("zombie_lock", "r1", "a1", "stale 300s")
         assert len(comm.alerts) == 1
         assert comm.alerts[0].type == "zombie_lock"
 
-    def test_add_conflict(self, tmp_path: Path) -> None:
-        comm = OrchestratorCommunicator(tmp_path / "outbox")
+    def test_add_conflict(self, comm: OrchestratorCommunicator) -> None:
         comm.add_conflict("r1", ["a1", "a2"], "lock_contention")
         assert len(comm.conflicts) == 1
         assert comm.conflicts[0].conflict_type == "lock_contention"
 
-    def test_multiple_alerts(self, tmp_path: Path) -> None:
-        comm = OrchestratorCommunicator(tmp_path / "outbox")
+    def test_multiple_alerts(self, comm: OrchestratorCommunicator) -> None:
         comm.add_alert("t1", "r1", "a1")
         comm.add_alert("t2", "r2", "a2")
         assert len(comm.alerts) == 2
 
-    def test_clear(self, tmp_path: Path) -> None:
-        comm = OrchestratorCommunicator(tmp_path / "outbox")
+    def test_clear(self, comm: OrchestratorCommunicator) -> None:
         comm.add_alert("t1", "r1", "a1")
         comm.add_conflict("r1", ["a1"], "x")
         comm.clear()
@@ -85,7 +94,7 @@ class TestWriteSystemStatus:
             resource_state={"r1": {"modifying": False}},
         )
         assert path.exists()
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data["type"] == "system_status"
         assert data["controller_id"] == "ctrl-01"
         assert data["health"]["overall_status"] == "healthy"
@@ -106,7 +115,7 @@ class TestWriteAlerts:
         comm.add_alert("zombie_lock", "r1", "a1", "details")
         path = comm.write_alerts()
         assert path.exists()
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data["type"] == "alerts"
         assert len(data["alerts"]) == 1
         assert data["alerts"][0]["type"] == "zombie_lock"
@@ -115,7 +124,7 @@ class TestWriteAlerts:
         outbox = tmp_path / "outbox"
         comm = OrchestratorCommunicator(outbox)
         path = comm.write_alerts()
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data["alerts"] == []
 
 
@@ -128,7 +137,7 @@ class TestWriteConflicts:
         comm.add_conflict("r1", ["a1", "a2"], "contention")
         path = comm.write_conflicts()
         assert path.exists()
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data["type"] == "conflicts"
         assert len(data["conflicts"]) == 1
 
@@ -142,11 +151,24 @@ class TestWriteOrchestratorAlert:
         alert = Alert(type="critical", resource_id="r1", agent_id="a1")
         path = comm.write_orchestrator_alert(alert)
         assert path.exists()
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data["type"] == "orchestrator_alert"
         assert data["alert"]["type"] == "critical"
 
 
+@pytest.fixture(scope="class")
+def flushed_comm(
+    tmp_path_factory: pytest.TempPathFactory,
+) -> tuple[OrchestratorCommunicator, Path]:
+    """Communicator that has flushed one alert and one conflict (shared per class)."""
+    outbox = tmp_path_factory.mktemp("out")
+    comm = OrchestratorCommunicator(outbox)
+    comm.add_alert("t1", "r1", "a1")
+    comm.add_conflict("r1", ["a1"], "x")
+    comm.flush_all({"status": "ok"}, {})
+    return comm, outbox
+
+
 class TestFlushAll:
     """Test flush_all."""
 
@@ -158,20 +180,17 @@ class TestFlushAll:
         assert not (outbox / "alerts.json").exists()
         assert not (outbox / "conflicts.json").exists()
 
-    def test_flush_writes_all_when_populated(self, tmp_path: Path) -> None:
-        outbox = tmp_path / "outbox"
-        comm = OrchestratorCommunicator(outbox)
-        comm.add_alert("t1", "r1", "a1")
-        comm.add_conflict("r1", ["a1"], "x")
-        comm.flush_all({"status": "ok"}, {})
+    def test_flush_writes_all_when_populated(
+        self, flushed_comm: tuple[OrchestratorCommunicator, Path]
+    ) -> None:
+        _, outbox = flushed_comm
         assert (outbox / "system_status.json").exists()
         assert (outbox / "alerts.json").exists()
         assert (outbox / "conflicts.json").exists()
 
-    def test_clear_after_flush(self, tmp_path: Path) -> None:
-        outbox = tmp_path / "outbox"
-        comm = OrchestratorCommunicator(outbox)
-        comm.add_alert("t1", "r1", "a1")
-        comm.flush_all({}, {})
+    def test_clear_after_flush(
+        self, flushed_comm: tuple[OrchestratorCommunicator, Path]
+    ) -> None:
+        comm, _ = flushed_comm
         comm.clear()
         assert comm.alerts == []
@@ -4,8 +4,12 @@ from __future__ import annotations
 import json
 from pathlib import Path
 
+import pytest
+
 from Controller.resource_state_manager import ResourceStateEntry, ResourceStateManager
 
+pytestmark = pytest.mark.usefixtures("frozen_now")
+
 
 class TestResourceStateEntry:
     """Test the ResourceStateEntry dataclass."""
@@ -71,32 +75,63 @@ class TestResourceStateManagerPersistence:
         mgr.mark_modifying("res", "ag")
         assert state_file.exists()
 
+    def test_non_persistent_skips_disk(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "state.json"
+        state_file.write_text(
+            json.dumps({"r0": {"resource_id": "r0", "modifying": True}}),
+            encoding="utf-8",
+        )
+        mgr = ResourceStateManager(state_file, persistent=False)
+        assert mgr.get_all() == {}
+        mgr.mark_modifying("r1", "a1")
+        assert "r1" not in state_file.read_text(encoding="utf-8")
+
+    def test_from_dict(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "state.json"
+        mgr = ResourceStateManager.from_dict(
+            {"r1": ResourceStateEntry(resource_id="r1", modifying=True)},
+            state_file,
+        )
+        assert mgr.is_modifying("r1") is True
+        mgr.mark_idle("r1")
+        assert not state_file.exists()
+
 
 class TestMarkModifying:
     """Test mark_modifying / mark_idle / is_modifying."""
 
     def test_mark_modifying(self, tmp_path: Path) -> None:
         state_file = tmp_path / "state.json"
-        mgr = ResourceStateManager(state_file)
+        mgr = ResourceStateManager(state_file, persistent=False)
         mgr.mark_modifying("r1", "agent-a")
         assert mgr.is_modifying("r1") is True
 
-    def test_mark_idle(self, tmp_path: Path) -> None:
+    def test_mark_modifying_many(self, tmp_path: Path) -> None:
         state_file = tmp_path / "state.json"
         mgr = ResourceStateManager(state_file)
+        mgr.mark_modifying_many(["r1", "r2", "r3"], "agent-a")
+        assert [e.resource_id for e in mgr.get_active_resources()] == [
+            "r1", "r2", "r3",
+        ]
+        mgr2 = ResourceStateManager(state_file)
+        assert mgr2.get_all()["r2"].modified_by == "agent-a"
+
+    def test_mark_idle(self, tmp_path: Path) -> None:
+        state_file = tmp_path / "state.json"
+        mgr = ResourceStateManager(state_file, persistent=False)
         mgr.mark_modifying("r1", "agent-a")
         mgr.mark_idle("r1")
         assert mgr.is_modifying("r1") is False
 
     def test_mark_idle_unknown_resource(self, tmp_path: Path) -> None:
         state_file = tmp_path / "state.json"
-        mgr = ResourceStateManager(state_file)
+        mgr = ResourceStateManager(state_file, persistent=False)
         mgr.mark_idle("unknown")  # should not raise
         assert mgr.is_modifying("unknown") is False
 
     def test_is_modifying_unknown(self, tmp_path: Path) -> None:
         state_file = tmp_path / "state.json"
-        mgr = ResourceStateManager(state_file)
+        mgr = ResourceStateManager(state_file, persistent=False)
         assert mgr.is_modifying("nope") is False
 
 
@@ -105,7 +140,7 @@ class TestGetAll:
 
     def test_get_all(self, tmp_path: Path) -> None:
         state_file = tmp_path / "state.json"
-        mgr = ResourceStateManager(state_file)
+        mgr = ResourceStateManager(state_file, persistent=False)
         mgr.mark_modifying("r1", "a1")
         mgr.mark_modifying("r2", "a2")
         mgr.mark_idle("r1")
@@ -116,7 +151,7 @@ class TestGetAll:
 
     def test_get_active_resources(self, tmp_path: Path) -> None:
         state_file = tmp_path / "state.json"
-        mgr = ResourceStateManager(state_file)
+        mgr = ResourceStateManager(state_file, persistent=False)
         mgr.mark_modifying("r1", "a1")
         mgr.mark_modifying("r2", "a2")
         mgr.mark_idle("r1")
@@ -126,7 +161,7 @@ class TestGetAll:
 
     def test_get_active_empty(self, tmp_path: Path) -> None:
         state_file = tmp_path / "state.json"
-        mgr = ResourceStateManager(state_file)
+        mgr = ResourceStateManager(state_file, persistent=False)
         assert mgr.get_active_resources() == []
 
 
@@ -135,12 +170,12 @@ class TestRemove:
 
     def test_remove_existing(self, tmp_path: Path) -> None:
         state_file = tmp_path / "state.json"
-        mgr = ResourceStateManager(state_file)
+        mgr = ResourceStateManager(state_file, persistent=False)
         mgr.mark_modifying("r1", "a1")
         mgr.remove("r1")
         assert mgr.get_all() == {}
 
     def test_remove_nonexistent(self, tmp_path: Path) -> None:
         state_file = tmp_path / "state.json"
-        mgr = ResourceStateManager(state_file)
+        mgr = ResourceStateManager(state_file, persistent=False)
         mgr.remove("ghost")  # should not raise
@@ -2,7 +2,10 @@
 from __future__ import annotations
 
 import json
-from datetime import datetime, timezone, timedelta
+import os
+import shutil
+import tempfile
+from datetime import datetime, timedelta
 from pathlib import Path
 
 import pytest
@@ -10,26 +13,70 @@ import pytest
 from Controller.config import ControllerConfig
 from Controller.retry_manager import RetryManager, TaskRetryEntry
 
-
-@pytest.fixture
-def retry_config(tmp_path: Path) -> ControllerConfig:
-    """Config with state dir in tmp_path."""
-    (tmp_path / "Controller" / "inbox").mkdir(parents=True)
-    (tmp_path / "Controller" / "outbox").mkdir(parents=True)
-    (tmp_path / "audit" / "controller" / "test-ctrl").mkdir(parents=True)
-    (tmp_path / "locks").mkdir(parents=True)
-    (tmp_path / "Orchestrator").mkdir(parents=True)
-    state_dir = tmp_path / "Controller" / "state"
-    state_dir.mkdir(parents=True)
+pytestmark = pytest.mark.usefixtures("frozen_now")
+
+_SHM_DIR = Path("/dev/shm")
+
+
+def _fast_tmp(tmp_path: Path, request: pytest.FixtureRequest) -> Path:
+    """Return a ramdisk-backed temp dir when opted in, else *tmp_path*.
+
+    Set ``CONTROLLER_TESTS_USE_SHM=1`` to route test I/O through /dev/shm
+    (Linux). The directory is removed at teardown.
+    """
+    if (
+        os.environ.get("CONTROLLER_TESTS_USE_SHM") == "1"
+        and _SHM_DIR.is_dir()
+        and os.access(_SHM_DIR, os.W_OK)
+    ):
+        root = Path(tempfile.mkdtemp(dir=str(_SHM_DIR)))
+        request.addfinalizer(lambda: shutil.rmtree(root, ignore_errors=True))
+        return root
+    return tmp_path
+
+
+def _make_project_dirs(root: Path) -> None:
+    """Create the Controller project layout under *root* (idempotent)."""
+    for rel in (
+        ("Controller", "inbox"),
+        ("Controller", "outbox"),
+        ("Controller", "state"),
+        ("audit", "controller", "test-ctrl"),
+        ("locks",),
+        ("Orchestrator",),
+    ):
+        os.makedirs(root.joinpath(*rel), exist_ok=True)
+
+
+@pytest.fixture(scope="session")
+def retry_config_template(
+    tmp_path_factory: pytest.TempPathFactory, request: pytest.FixtureRequest
+) -> ControllerConfig:
+    """Project tree shared by all retry tests (built once per session)."""
+    root = _fast_tmp(tmp_path_factory.mktemp("retry"), request)
+    _make_project_dirs(root)
     return ControllerConfig(
         controller_id="test-ctrl",
-        project_root=tmp_path,
+        project_root=root,
         retry_max_per_task=3,
         retry_backoff_base=2.0,
         agent_health_paths={},
     )
 
 
+@pytest.fixture
+def retry_config(retry_config_template: ControllerConfig) -> ControllerConfig:
+    """Shared config with the retry state file reset for each test."""
+    retry_config_template.retry_state_file.unlink(missing_ok=True)
+    return retry_config_template
+
+
+@pytest.fixture
+def no_disk_state(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Turn RetryManager.save_state into a no-op for pure-logic tests."""
+    monkeypatch.setattr(RetryManager, "save_state", lambda self: None)
+
+
 class TestLoadSaveState:
     """Test load/save round-trip for retry state."""
 
@@ -47,12 +94,7 @@ class TestLoadSaveState:
 
     def test_load_empty_state(self, tmp_path: Path) -> None:
         """Fresh state dir with no retry_state.json loads empty."""
-        (tmp_path / "Controller" / "inbox").mkdir(parents=True)
-        (tmp_path / "Controller" / "outbox").mkdir(parents=True)
-        (tmp_path / "Controller" / "state").mkdir(parents=True)
-        (tmp_path / "audit" / "controller" / "test-ctrl").mkdir(parents=True)
-        (tmp_path / "locks").mkdir(parents=True)
-        (tmp_path / "Orchestrator").mkdir(parents=True)
+        _make_project_dirs(tmp_path)
         config = ControllerConfig(
             controller_id="test-ctrl",
             project_root=tmp_path,
@@ -71,6 +113,7 @@ class TestLoadSaveState:
         assert len(mgr._state) == 0
 
 
+@pytest.mark.usefixtures("no_disk_state")
 class TestShouldRetry:
     """Test should_retry logic with backoff."""
 
@@ -93,25 +136,16 @@ class TestShouldRetry:
         assert mgr.should_retry("task-y", "agent") is False
 
     def test_backoff_allows_after_wait(
-        self, retry_config: ControllerConfig
+        self, retry_config: ControllerConfig, frozen_now: datetime
     ) -> None:
         """After sufficient time, retry is allowed."""
-        mgr = RetryManager(retry_config)
-        # Manually create an entry with an old timestamp
-        past = datetime.now(timezone.utc) - timedelta(seconds=100)
-        entry = TaskRetryEntry(
-            task_id="task-z",
-            agent="agent",
-            team="team",
-            retry_count=1,
-            max_retries=3,
-            last_retry_ts=past.isoformat(),
-            status="retrying",
-        )
-        mgr._state["task-z"] = entry
+        mgr = RetryManager(retry_config, time_provider=lambda: frozen_now)
+        mgr.record_failure("task-z", "agent", "team")
+        mgr._time_provider = lambda: frozen_now + timedelta(seconds=100)
         assert mgr.should_retry("task-z", "agent") is True
 
 
+@pytest.mark.usefixtures("no_disk_state")
 class TestRecordFailureSuccess:
     """Test record_failure and record_success."""
 
@@ -189,7 +223,7 @@ class TestDirectiveGeneration:
         d = mgr.generate_retry_directive(entry)
         path = mgr.write_retry_directive(d, entry)
         assert path.exists()
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data["command"] == "retry_task"
 
     def test_write_escalation_directive(
@@ -210,24 +244,26 @@ class TestDirectiveGeneration:
 class TestCleanupStaleEntries:
     """Test cleanup_stale_entries."""
 
-    def test_cleanup_removes_old(self, retry_config: ControllerConfig) -> None:
+    def test_cleanup_removes_old(
+        self, retry_config: ControllerConfig, frozen_now: datetime
+    ) -> None:
         mgr = RetryManager(retry_config)
-        old_ts = (
-            datetime.now(timezone.utc) - timedelta(hours=100)
-        ).isoformat()
+        now = frozen_now
+        now_iso = now.isoformat()
+        old_iso = (now - timedelta(hours=100)).isoformat()
         mgr._state["old-task"] = TaskRetryEntry(
             task_id="old-task",
             agent="a",
             team="t",
             retry_count=2,
-            last_retry_ts=old_ts,
+            last_retry_ts=old_iso,
         )
         mgr._state["new-task"] = TaskRetryEntry(
             task_id="new-task",
             agent="b",
             team="t",
             retry_count=1,
-            last_retry_ts=datetime.now(timezone.utc).isoformat(),
+            last_retry_ts=now_iso,
         )
         removed = mgr.cleanup_stale_entries(max_age_hours=72)
         assert removed == 1
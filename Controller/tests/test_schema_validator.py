@@ -1,4 +1,10 @@
-"""Tests for Controller.schema_validator."""
+"""Tests for Controller.schema_validator.
+
+These tests are pure CPU: fixtures come from module-level templates, the
+validators are compiled once at import, and nothing touches the
+filesystem. They can be scheduled freely across workers, e.g.
+``pytest -n auto Controller/tests/test_schema_validator.py`` (pytest-xdist).
+"""
 from __future__ import annotations
 
 from datetime import datetime, timezone
@@ -12,31 +18,34 @@ from Controller.schema_validator import (
 )
 
 
+_NOW = datetime.now(timezone.utc).isoformat()
+
+_TEMPLATE_TASK: dict[str, object] = {
+    "task_id": "abc123",
+    "task_type": "process_inbox",
+    "status": "PENDING",
+    "created_at": _NOW,
+    "updated_at": _NOW,
+    "payload": {},
+    "retries": 0,
+}
+
+_TEMPLATE_AUDIT: dict[str, object] = {
+    "timestamp": _NOW,
+    "task_id": "abc123",
+    "agent": "controller",
+    "action": "test_action",
+    "status": "ok",
+    "details": {},
+}
+
+
 def _make_task(**overrides: object) -> dict[str, object]:
-    base: dict[str, object] = {
-        "task_id": "abc123",
-        "task_type": "process_inbox",
-        "status": "PENDING",
-        "created_at": datetime.now(timezone.utc).isoformat(),
-        "updated_at": datetime.now(timezone.utc).isoformat(),
-        "payload": {},
-        "retries": 0,
-    }
-    base.update(overrides)
-    return base
+    return {**_TEMPLATE_TASK, **overrides}
 
 
 def _make_audit(**overrides: object) -> dict[str, object]:
-    base: dict[str, object] = {
-        "timestamp": datetime.now(timezone.utc).isoformat(),
-        "task_id": "abc123",
-        "agent": "controller",
-        "action": "test_action",
-        "status": "ok",
-        "details": {},
-    }
-    base.update(overrides)
-    return base
+    return {**_TEMPLATE_AUDIT, **overrides}
 
 
 class TestValidateTask:
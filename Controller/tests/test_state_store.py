@@ -2,12 +2,15 @@
 from __future__ import annotations
 
 import json
+import os
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
 from Controller.state_store import (
     StateStoreError,
+    append_jsonl,
     atomic_write,
     load_json,
     save_json,
@@ -19,6 +22,12 @@ def state_dir(tmp_path: Path) -> Path:
     return tmp_path / "state"
 
 
+@pytest.fixture(scope="session")
+def _empty_state_dir(tmp_path_factory: pytest.TempPathFactory) -> Path:
+    """Shared empty directory for tests that never write to disk."""
+    return tmp_path_factory.mktemp("empty_state")
+
+
 class TestSaveJson:
     def test_creates_file(self, state_dir: Path) -> None:
         path = state_dir / "data.json"
@@ -33,16 +42,29 @@ class TestSaveJson:
     def test_correct_content(self, state_dir: Path) -> None:
         path = state_dir / "data.json"
         save_json(path, {"a": 1, "b": [2, 3]})
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data == {"a": 1, "b": [2, 3]}
 
     def test_overwrites_existing(self, state_dir: Path) -> None:
         path = state_dir / "data.json"
         save_json(path, {"v": 1})
         save_json(path, {"v": 2})
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data == {"v": 2}
 
+    def test_compact_output(self, state_dir: Path) -> None:
+        path = state_dir / "data.json"
+        save_json(path, {"a": 1, "b": ["é"]}, pretty=False)
+        assert path.read_bytes() == '{"a":1,"b":["é"]}'.encode("utf-8")
+
+    def test_compact_stdlib_fallback(
+        self, state_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("Controller.state_store._orjson_dumps", None)
+        path = state_dir / "data.json"
+        save_json(path, {"a": 1, "b": ["é"]}, pretty=False)
+        assert path.read_bytes() == '{"a":1,"b":["é"]}'.encode("utf-8")
+
 
 class TestLoadJson:
     def test_load_existing(self, state_dir: Path) -> None:
@@ -51,12 +73,14 @@ class TestLoadJson:
         path.write_text('{"x": 42}', encoding="utf-8")
         assert load_json(path) == {"x": 42}
 
-    def test_load_missing_returns_default(self, state_dir: Path) -> None:
-        path = state_dir / "missing.json"
+    def test_load_missing_returns_default(self, _empty_state_dir: Path) -> None:
+        path = _empty_state_dir / "missing.json"
         assert load_json(path) is None
 
-    def test_load_missing_with_custom_default(self, state_dir: Path) -> None:
-        path = state_dir / "missing.json"
+    def test_load_missing_with_custom_default(
+        self, _empty_state_dir: Path
+    ) -> None:
+        path = _empty_state_dir / "missing.json"
         assert load_json(path, default={}) == {}
 
     def test_load_corrupt_returns_default(self, state_dir: Path) -> None:
@@ -70,29 +94,77 @@ class TestAtomicWrite:
     def test_basic_write(self, state_dir: Path) -> None:
         path = state_dir / "atomic.json"
         atomic_write(path, {"atomic": True})
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data == {"atomic": True}
 
     def test_no_temp_files_left(self, state_dir: Path) -> None:
         path = state_dir / "clean.json"
         atomic_write(path, {"data": 1})
-        tmp_files = list(state_dir.glob(".*_*.tmp"))
+        tmp_files = [
+            e.name for e in os.scandir(state_dir)
+            if e.name.startswith(".") and e.name.endswith(".tmp")
+        ]
         assert len(tmp_files) == 0
 
     def test_replaces_existing(self, state_dir: Path) -> None:
         path = state_dir / "replace.json"
         atomic_write(path, {"v": "old"})
         atomic_write(path, {"v": "new"})
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data == {"v": "new"}
 
     def test_unicode_content(self, state_dir: Path) -> None:
         path = state_dir / "unicode.json"
         atomic_write(path, {"name": "Caf\u00e9 \u2615"})
-        data = json.loads(path.read_text(encoding="utf-8"))
+        data = json.loads(path.read_bytes())
         assert data["name"] == "Caf\u00e9 \u2615"
 
     def test_invalid_path_raises(self, state_dir: Path) -> None:
         # Path with null byte is invalid
         with pytest.raises((StateStoreError, OSError, ValueError)):
             atomic_write(state_dir / "inv\x00alid.json", {})
+
+    def test_fsync_when_not_skipped(
+        self, state_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.delenv("CONTROLLER_ATOMIC_WRITE_SKIP_FSYNC", raising=False)
+        fsync = MagicMock()
+        monkeypatch.setattr(os, "fsync", fsync)
+        atomic_write(state_dir / "durable.json", {"durable": True})
+        fsync.assert_called_once()
+
+    def test_short_writes_are_completed(
+        self, state_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        real_write = os.write
+        monkeypatch.setattr(
+            os, "write", lambda fd, data: real_write(fd, data[:8])
+        )
+        data = {"key": "value" * 20, "desc": "caf\u00e9"}
+        atomic_write(state_dir / "short.json", data)
+        append_jsonl(state_dir / "short.jsonl", data)
+        assert load_json(state_dir / "short.json") == data
+        line = (state_dir / "short.jsonl").read_bytes()
+        assert json.loads(line) == data
+
+    @pytest.mark.parametrize("value", ["1", "true", "YES"])
+    def test_fsync_skipped_when_env_set(
+        self, state_dir: Path, monkeypatch: pytest.MonkeyPatch, value: str
+    ) -> None:
+        monkeypatch.setenv("CONTROLLER_ATOMIC_WRITE_SKIP_FSYNC", value)
+        fsync = MagicMock()
+        monkeypatch.setattr(os, "fsync", fsync)
+        atomic_write(state_dir / "fast.json", {"durable": False})
+        append_jsonl(state_dir / "fast.jsonl", {"durable": False})
+        fsync.assert_not_called()
+
+    @pytest.mark.parametrize("value", ["0", "false", "no", ""])
+    def test_fsync_kept_for_falsy_env(
+        self, state_dir: Path, monkeypatch: pytest.MonkeyPatch, value: str
+    ) -> None:
+        monkeypatch.setenv("CONTROLLER_ATOMIC_WRITE_SKIP_FSYNC", value)
+        fsync = MagicMock()
+        monkeypatch.setattr(os, "fsync", fsync)
+        atomic_write(state_dir / "durable.json", {"durable": True})
+        append_jsonl(state_dir / "durable.jsonl", {"durable": True})
+        assert fsync.call_count == 2
@@ -58,8 +58,10 @@ class TestCreateTask:
     def test_persists_to_disk(self, tasks_file: Path) -> None:
         mgr = TaskManager(tasks_file)
         tid = mgr.create_task("test", {})
-        data = json.loads(tasks_file.read_text(encoding="utf-8"))
-        assert tid in data
+        journal = tasks_file.with_suffix(".jsonl")
+        record = json.loads(journal.read_bytes().splitlines()[-1])
+        assert record["op"] == "create"
+        assert record["task"]["task_id"] == tid
 
 
 class TestGetTask:
@@ -224,6 +226,74 @@ class TestPersistence:
         assert task["status"] == "RUNNING"
         assert task["payload"] == {"data": True}
 
+    def test_snapshot_and_replay_round_trip(self, tasks_file: Path) -> None:
+        mgr1 = TaskManager(tasks_file, compact_every=3)
+        tid = mgr1.create_task("persist", {"data": True})
+        mgr1.update_task_status(tid, "RUNNING")
+        mgr1.update_task_status(tid, "FAILED")  # 3rd record -> compaction
+        journal = tasks_file.with_suffix(".jsonl")
+        assert not journal.exists()
+        snapshot = json.loads(tasks_file.read_bytes())
+        assert snapshot[tid]["status"] == "FAILED"
+
+        mgr1.retry_task(tid)  # journaled on top of the snapshot
+        assert journal.exists()
+
+        mgr2 = TaskManager(tasks_file)
+        task = mgr2.get_task(tid)
+        assert task is not None
+        assert task["status"] == "PENDING"
+        assert task["retries"] == 1
+
+    def test_torn_journal_tail_skipped(self, tasks_file: Path) -> None:
+        mgr1 = TaskManager(tasks_file)
+        tid = mgr1.create_task("persist", {})
+        with open(tasks_file.with_suffix(".jsonl"), "ab") as fh:
+            fh.write(b'{"op": "upd')
+        mgr2 = TaskManager(tasks_file)
+        assert mgr2.get_task(tid) is not None
+
+    def test_append_after_torn_tail_survives_reload(
+        self, tasks_file: Path
+    ) -> None:
+        mgr1 = TaskManager(tasks_file)
+        tid_a = mgr1.create_task("a", {})
+        with open(tasks_file.with_suffix(".jsonl"), "ab") as fh:
+            fh.write(b'{"op": "upd')
+        mgr2 = TaskManager(tasks_file)
+        tid_b = mgr2.create_task("b", {})
+        mgr3 = TaskManager(tasks_file)
+        assert mgr3.get_task(tid_a) is not None
+        assert mgr3.get_task(tid_b) is not None
+
+    def test_torn_non_ascii_journal_tail_skipped(
+        self, tasks_file: Path
+    ) -> None:
+        mgr1 = TaskManager(tasks_file)
+        tid = mgr1.create_task("persist", {})
+        with open(tasks_file.with_suffix(".jsonl"), "ab") as fh:
+            # Cut in the middle of the two-byte UTF-8 "\u00e9".
+            fh.write(
+                b'{"op":"create","task":{"task_id":"x","desc":"caf\xc3'
+            )
+        mgr2 = TaskManager(tasks_file)
+        assert mgr2.get_task(tid) is not None
+        assert mgr2.get_task("x") is None
+
+    def test_malformed_journal_update_skipped(self, tasks_file: Path) -> None:
+        mgr1 = TaskManager(tasks_file)
+        tid = mgr1.create_task("persist", {})
+        with open(tasks_file.with_suffix(".jsonl"), "ab") as fh:
+            for fields in (b'"oops"', b"[1, 2]", b"null"):
+                fh.write(
+                    b'{"op":"update","task_id":"%s","fields":%s}\n'
+                    % (tid.encode(), fields)
+                )
+        mgr2 = TaskManager(tasks_file)
+        task = mgr2.get_task(tid)
+        assert task is not None
+        assert task["status"] == "PENDING"
+
     def test_corrupt_file_starts_fresh(self, tasks_file: Path) -> None:
         tasks_file.parent.mkdir(parents=True, exist_ok=True)
         tasks_file.write_text("not json", encoding="utf-8")
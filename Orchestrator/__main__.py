@@ -3,24 +3,167 @@
 Usage:
     python -m Orchestrator --run-once
     python -m Orchestrator --run-once --orchestrator-dir /app/Orchestrator
+    python -m Orchestrator --server --socket /run/orchestrator.sock
+    python -m Orchestrator --run-once --socket /run/orchestrator.sock
+
+``--server`` forks a daemon that keeps one Orchestrator warm and answers
+``VERIFY <orchestrator-dir>`` requests on a Unix-domain socket; it refuses
+to start while another daemon answers on the socket.  ``--run-once
+--socket`` asks the daemon first and falls back to in-process validation
+when it is not running or serves a different directory.  Restart the
+daemon after upgrading the code.
 """
 from __future__ import annotations
 
 import argparse
+import json
 import logging
+import os
+import socket
 import sys
 from pathlib import Path
+from typing import Any
 
+from Orchestrator import json_codec
 from Orchestrator.orchestrator import Orchestrator
 
 logger = logging.getLogger(__name__)
 
+_VERIFY_CMD = b"VERIFY"
+_CLIENT_TIMEOUT = 30.0
+# Per-connection timeout on the daemon side, so a silent client cannot
+# stall the others.
+_SERVER_TIMEOUT = 5.0
+# Longest request line the daemon reads.
+_MAX_FRAME = 4096
+
 
 def _default_orchestrator_dir() -> Path:
     """Return the Orchestrator package directory (sibling to this file)."""
     return Path(__file__).resolve().parent
 
 
+def _verify(orch: Orchestrator) -> dict[str, Any]:
+    """Run integrity validation + health check and return a JSON-able report."""
+    result = orch.verify_state_integrity()
+    health = orch.health_check()
+    return {
+        "valid": result.valid,
+        "errors": result.errors,
+        "warnings": result.warnings,
+        "health": health.status.value,
+    }
+
+
+def _recv_line(conn: socket.socket, limit: int | None = None) -> bytes:
+    """Read from *conn* up to and including the first newline (or EOF).
+
+    Stops early once more than *limit* bytes have arrived.
+    """
+    buf = bytearray()
+    while not buf.endswith(b"\n"):
+        if limit is not None and len(buf) > limit:
+            break
+        chunk = conn.recv(4096)
+        if not chunk:
+            break
+        buf += chunk
+    return bytes(buf)
+
+
+def _verify_frame(orch_dir: Path) -> bytes:
+    """Request line asking the daemon to verify *orch_dir*."""
+    return _VERIFY_CMD + b" " + os.fsencode(orch_dir.resolve()) + b"\n"
+
+
+def _handle_frame(orch: Orchestrator, frame: bytes, expected: bytes) -> bytes:
+    """Reply (without the newline) to one request line."""
+    if frame != expected:
+        cmd = frame.split(b" ", 1)[0].rstrip(b"\n")
+        if cmd == _VERIFY_CMD and frame.endswith(b"\n"):
+            return json_codec.dumps({"error": "orchestrator dir mismatch"})
+        return json_codec.dumps({"error": "unknown command"})
+    return json_codec.dumps(_verify(orch))
+
+
+def _daemon_running(socket_path: Path) -> bool:
+    """Whether something accepts connections on *socket_path*."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+            probe.settimeout(_SERVER_TIMEOUT)
+            probe.connect(str(socket_path))
+    except OSError:
+        return False
+    return True
+
+
+def _serve(
+    orch: Orchestrator,
+    orch_dir: Path,
+    socket_path: Path,
+    max_requests: int | None = None,
+) -> None:
+    """Answer ``VERIFY`` frames on *socket_path* until *max_requests* served.
+
+    Only requests naming *orch_dir* are verified.  A client that stalls,
+    disconnects early or sends garbage costs at most ``_SERVER_TIMEOUT``
+    and is logged; the daemon keeps serving.
+
+    Raises:
+        RuntimeError: If a daemon already answers on *socket_path*.
+    """
+    if _daemon_running(socket_path):
+        raise RuntimeError(f"A daemon is already serving {socket_path}")
+    expected = _verify_frame(orch_dir)
+    socket_path.unlink(missing_ok=True)  # Stale socket of a dead daemon.
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as srv:
+        srv.bind(str(socket_path))
+        srv.listen()
+        served = 0
+        while max_requests is None or served < max_requests:
+            conn, _ = srv.accept()
+            with conn:
+                try:
+                    conn.settimeout(_SERVER_TIMEOUT)
+                    frame = _recv_line(conn, _MAX_FRAME)
+                    reply = _handle_frame(orch, frame, expected)
+                    conn.sendall(reply + b"\n")
+                except (OSError, ValueError) as exc:
+                    logger.warning("VERIFY connection dropped: %s", exc)
+            served += 1
+
+
+def _query_daemon(
+    socket_path: Path, orch_dir: Path
+) -> dict[str, Any] | None:
+    """Ask a running daemon to verify *orch_dir*; None when it cannot."""
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+            conn.settimeout(_CLIENT_TIMEOUT)
+            conn.connect(str(socket_path))
+            conn.sendall(_verify_frame(orch_dir))
+            reply: dict[str, Any] = json.loads(_recv_line(conn))
+    except (OSError, ValueError):
+        return None
+    if "valid" not in reply:
+        return None
+    return reply
+
+
+def _daemonize() -> bool:
+    """Fork a detached child. Returns True in the child, False in the parent."""
+    pid = os.fork()
+    if pid > 0:
+        print(f"Orchestrator server started (pid={pid})")
+        return False
+    os.setsid()
+    devnull = os.open(os.devnull, os.O_RDWR)
+    for fd in (0, 1, 2):
+        os.dup2(devnull, fd)
+    os.close(devnull)
+    return True
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Orchestrator — state management service"
@@ -30,6 +173,16 @@ def main() -> int:
         action="store_true",
         help="Validate state integrity once and exit",
     )
+    parser.add_argument(
+        "--server",
+        action="store_true",
+        help="Fork a warm daemon serving VERIFY requests on --socket",
+    )
+    parser.add_argument(
+        "--socket",
+        default=None,
+        help="Unix-domain socket path of the warm daemon",
+    )
     parser.add_argument(
         "--orchestrator-dir",
         default=None,
@@ -37,10 +190,15 @@ def main() -> int:
     )
     args = parser.parse_args()
 
-    if not args.run_once:
+    if args.server and not args.socket:
+        parser.print_help()
+        print("\nError: --server requires --socket")
+        return 1
+
+    if not args.run_once and not args.server:
         parser.print_help()
         print(
-            "\nError: --run-once is required"
+            "\nError: --run-once or --server is required"
             " (continuous mode not yet supported)"
         )
         return 1
@@ -55,27 +213,42 @@ def main() -> int:
         if args.orchestrator_dir
         else _default_orchestrator_dir()
     )
-    orch = Orchestrator(orchestrator_dir=orch_dir)
 
-    result = orch.verify_state_integrity()
-    if result.valid:
+    if args.server:
+        if _daemon_running(Path(args.socket)):
+            print(f"Error: a daemon is already serving {args.socket}")
+            return 1
+        if not _daemonize():
+            return 0
+        _serve(
+            Orchestrator(orchestrator_dir=orch_dir),
+            orch_dir,
+            Path(args.socket),
+        )
+        return 0
+
+    report = (
+        _query_daemon(Path(args.socket), orch_dir) if args.socket else None
+    )
+    if report is None:
+        report = _verify(Orchestrator(orchestrator_dir=orch_dir))
+
+    if report["valid"]:
         logger.info("State validation passed")
     else:
         logger.warning(
             "State validation found %d error(s)",
-            len(result.errors),
+            len(report["errors"]),
         )
-        for err in result.errors:
+        for err in report["errors"]:
             logger.warning("  - %s", err)
 
-    if result.warnings:
-        for warn in result.warnings:
-            logger.info("  warning: %s", warn)
+    for warn in report["warnings"]:
+        logger.info("  warning: %s", warn)
 
-    health = orch.health_check()
-    logger.info("Health status: %s", health.status.value)
+    logger.info("Health status: %s", report["health"])
 
-    return 0 if result.valid else 1
+    return 0 if report["valid"] else 1
 
 
 if __name__ == "__main__":
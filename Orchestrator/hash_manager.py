@@ -1,26 +1,320 @@
-"""SHA-256 hash computation and audit logging for state integrity."""
+"""State hash computation (SHA-256 by default) and audit logging."""
 
 from __future__ import annotations
 
 import hashlib
-import json
 import logging
 import os
+import queue
+import re
+import sys
+import threading
+import time
+import weakref
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
+from types import TracebackType
+from typing import Callable, Protocol
+
+from . import json_codec
+from .state_processor import write_all as _write_all
 
 logger = logging.getLogger(__name__)
 
+_READ_CHUNK = 1 << 16
+
+# Fixed-shape audit entry, byte-identical to json_codec.dumps() of the same
+# dict.  Only valid when no field needs JSON escaping (see _NEEDS_ESCAPE).
+_ENTRY_TMPL = (
+    b'{"timestamp":"%b","operation":"%b","status":"%b",'
+    b'"hash":"%b","request_id":"%b"}\n'
+)
+_NEEDS_ESCAPE = re.compile(r'["\\\x00-\x1f]')
+
+
+class _Hasher(Protocol):
+    """The part of the hashlib object API HashManager relies on."""
+
+    def update(self, data: bytes | bytearray | memoryview, /) -> None: ...
+
+    def copy(self) -> _Hasher: ...
+
+    def digest(self) -> bytes: ...
+
+    def hexdigest(self) -> str: ...
+
+
+def _blake2b_256(data: bytes | bytearray | memoryview = b"") -> _Hasher:
+    return hashlib.blake2b(data, digest_size=32)
+
+
+# Supported digest algorithms; each yields a 32-byte (64 hex char) digest.
+_ALGORITHMS: dict[str, Callable[..., _Hasher]] = {
+    "sha256": hashlib.sha256,
+    "blake2b": _blake2b_256,
+}
+
+# Queue item: (lines, fsync, drained event) or None to stop the writer.
+_WriterItem = tuple[bytes, bool, threading.Event | None] | None
+
+
+class _AuditWriter:
+    """Background thread appending audit lines to the log.
+
+    Owns its own ``O_APPEND`` fd.  Each wake-up drains everything queued
+    so far and appends it with one ``write`` (+ ``fsync`` if any item
+    asked for one).  A failed write is kept and re-raised by the next
+    :meth:`drain` or :meth:`close`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self._path = path
+        self._queue: queue.SimpleQueue[_WriterItem] = queue.SimpleQueue()
+        self._fd: int | None = None
+        self._error: OSError | None = None
+        self._thread = threading.Thread(
+            target=self._run, name="audit-log-writer", daemon=True
+        )
+        self._thread.start()
+
+    def put(self, data: bytes, fsync: bool) -> None:
+        self._queue.put((data, fsync, None))
+
+    def drain(self, fsync: bool = False) -> None:
+        """Block until every line queued so far is written."""
+        done = threading.Event()
+        self._queue.put((b"", fsync, done))
+        done.wait()
+        self._raise_error()
+
+    def close(self) -> None:
+        """Write what is queued, stop the thread and close the fd."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        q = self._queue
+        stop = False
+        while not stop:
+            item = q.get()
+            chunks: list[bytes] = []
+            waiters: list[threading.Event] = []
+            fsync = False
+            while True:
+                if item is None:
+                    stop = True
+                else:
+                    data, sync, done = item
+                    chunks.append(data)
+                    fsync |= sync
+                    if done is not None:
+                        waiters.append(done)
+                try:
+                    item = q.get_nowait()
+                except queue.Empty:
+                    break
+            data = b"".join(chunks)
+            try:
+                if data or (fsync and self._fd is not None):
+                    fd = self._open()
+                    _write_all(fd, data)
+                    if fsync:
+                        os.fsync(fd)
+            except OSError as exc:
+                logger.error("Audit log write failed: %s", exc)
+                if self._error is None:
+                    self._error = exc
+            for done in waiters:
+                done.set()
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(
+                str(self._path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644
+            )
+        return self._fd
+
 
 class HashManager:
-    """Compute SHA-256 hashes and log them to an audit file (JSONL)."""
+    """Compute content hashes and log them to an audit file (JSONL).
+
+    Hashes are SHA-256 unless ``algorithm="blake2b"`` (BLAKE2b with a
+    32-byte digest) is chosen; BLAKE2b is faster on CPUs without SHA
+    extensions.  Digests are only comparable between managers using the
+    same algorithm, so STATE.md's ``.md.hash`` companion stays SHA-256.
+
+    The audit log is opened once (``O_APPEND``) and kept open, so each
+    entry costs a single ``write``.  With ``durable=True`` (default) every
+    write is fsync'd; with ``durable=False`` syncing is left to explicit
+    :meth:`flush` calls.  Inside :meth:`batch` entries are buffered and
+    written with a single ``write`` (+ ``fsync``) when the outermost batch
+    exits.  Call :meth:`close` (or use the instance as a context manager)
+    when done; the fd is also closed on garbage collection.
+
+    With ``background=True`` writes (and their fsyncs) are handed to a
+    writer thread, so :meth:`log_hash` and :meth:`append_entries` return
+    before the entry reaches the disk.  :meth:`flush` waits for queued
+    entries; an entry not yet flushed may be lost if the process dies.
+    """
 
-    def __init__(self, audit_log_path: Path) -> None:
+    def __init__(
+        self,
+        audit_log_path: Path,
+        *,
+        durable: bool = True,
+        algorithm: str = "sha256",
+        background: bool = False,
+    ) -> None:
+        try:
+            self._new_hash = _ALGORITHMS[algorithm]
+        except KeyError:
+            raise ValueError(
+                f"Unsupported hash algorithm {algorithm!r}; "
+                f"expected one of {sorted(_ALGORITHMS)}"
+            ) from None
+        self._algorithm = algorithm
         self._audit_log_path = audit_log_path
+        self._durable = durable
+        self._background = background
+        self._writer: _AuditWriter | None = None
+        self._writer_finalizer: weakref.finalize[[], HashManager] | None = None
+        self._mu = threading.Lock()
+        self._batch_depth = 0
+        self._pending = bytearray()
+        self._fd: int | None = None
+        self._finalizer: weakref.finalize[[int], HashManager] | None = None
+        # (epoch milliseconds, ISO string) of the last formatted timestamp.
+        self._ts_cache: tuple[int, str] = (-1, "")
+
+    def compute_hash(self, state_content: str | bytes) -> str:
+        """Compute the hex digest of state content.
+
+        Pass ``bytes`` when available to skip the UTF-8 encode copy.
+        """
+        if isinstance(state_content, str):
+            state_content = state_content.encode("utf-8")
+        return self._new_hash(state_content).hexdigest()
+
+    def compute_digest(self, content: str | bytes) -> bytes:
+        """Compute the raw 32-byte digest of *content*.
+
+        For callers that store or compare digests as bytes; saves the
+        ``hexdigest()`` / ``bytes.fromhex`` round trip.
+        """
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        return self._new_hash(content).digest()
+
+    def compute_hash_bytes(self, data: bytes | bytearray | memoryview) -> str:
+        """Compute the hex digest of raw bytes (no decode/encode pass).
+
+        Accepts any buffer, so a ``memoryview`` slice is hashed in place.
+        """
+        return self._new_hash(data).hexdigest()
 
-    def compute_hash(self, state_content: str) -> str:
-        """Compute SHA-256 hex digest of state content."""
-        return hashlib.sha256(state_content.encode("utf-8")).hexdigest()
+    def compute_hashes(self, items: Iterable[str | bytes]) -> list[str]:
+        """Compute hex digests for many small payloads at once.
+
+        ``hashlib`` delegates to OpenSSL, which picks SHA-NI (Intel Ice
+        Lake+, AMD Zen) or the ARMv8 SHA2 extensions (Apple, Graviton)
+        when the CPU has them; batching keeps the per-item interpreter
+        overhead down so small inputs benefit as well.
+        """
+        base = self._new_hash()
+        digests: list[str] = []
+        for item in items:
+            if isinstance(item, str):
+                item = item.encode("utf-8")
+            h = base.copy()
+            h.update(item)
+            digests.append(h.hexdigest())
+        return digests
+
+    def compute_hash_file(self, path: Path) -> str:
+        """Compute the hex digest of a file's raw bytes, streamed.
+
+        Peak memory stays at one buffer regardless of file size; for
+        SHA-256 on 3.11+ ``hashlib.file_digest`` reads straight from the
+        unbuffered fd and hashes with the GIL released.
+        """
+        with open(path, "rb", buffering=0) as fh:
+            if sys.version_info >= (3, 11) and self._algorithm == "sha256":
+                return hashlib.file_digest(fh, "sha256").hexdigest()
+            h = self._new_hash()
+            for chunk in iter(lambda: fh.read(_READ_CHUNK), b""):
+                h.update(chunk)
+            return h.hexdigest()
+
+    @contextmanager
+    def batch(self) -> Iterator[None]:
+        """Buffer :meth:`log_hash` entries until the outermost batch exits.
+
+        Batches nest; the pending entries are flushed even if the body
+        raises.
+        """
+        with self._mu:
+            self._batch_depth += 1
+        try:
+            yield
+        finally:
+            with self._mu:
+                self._batch_depth -= 1
+                if self._batch_depth == 0:
+                    self._write_pending(self._durable)
+
+    def flush(self, fsync: bool = False) -> None:
+        """Write any buffered entries now; optionally fsync the audit log.
+
+        In background mode this also waits for the writer thread.
+        """
+        with self._mu:
+            self._write_pending(fsync)
+            if self._writer is not None:
+                self._writer.drain(fsync)
+            elif fsync and self._fd is not None:
+                os.fsync(self._fd)
+
+    def close(self) -> None:
+        """Flush buffered entries and close the audit log fd.
+
+        In background mode the writer thread is drained and stopped.
+        """
+        with self._mu:
+            self._write_pending(self._durable)
+            writer_finalizer, self._writer_finalizer = (
+                self._writer_finalizer, None
+            )
+            self._writer = None
+            if writer_finalizer is not None:
+                writer_finalizer()
+            if self._finalizer is not None:
+                self._finalizer()
+                self._finalizer = None
+            self._fd = None
+
+    def __enter__(self) -> HashManager:
+        return self
+
+    def __exit__(
+        self,
+        exc_type: type[BaseException] | None,
+        exc_val: BaseException | None,
+        exc_tb: TracebackType | None,
+    ) -> None:
+        self.close()
 
     def log_hash(
         self,
@@ -29,30 +323,63 @@ class HashManager:
         request_id: str = "",
         status: str = "ok",
         error: str = "",
+        at: datetime | None = None,
     ) -> None:
-        """Append hash entry to audit log (JSONL format, fsync'd)."""
-        entry: dict[str, str] = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
-            "operation": operation,
-            "status": status,
-            "hash": state_hash,
-            "request_id": request_id,
-        }
-        if error:
-            entry["error"] = error
-
-        self._audit_log_path.parent.mkdir(parents=True, exist_ok=True)
-        line = json.dumps(entry, ensure_ascii=False) + "\n"
-
-        fd = os.open(
-            str(self._audit_log_path),
-            os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+        """Append hash entry to audit log (JSONL format, fsync'd).
+
+        Same arguments as :meth:`log_hash_buffered`; the entry is written
+        immediately (or buffered inside :meth:`batch`).
+        """
+        self.append_entries(
+            self.log_hash_buffered(
+                state_hash, operation, request_id, status, error, at
+            )
         )
-        try:
-            os.write(fd, line.encode("utf-8"))
-            os.fsync(fd)
-        finally:
-            os.close(fd)
+
+    def log_hash_buffered(
+        self,
+        state_hash: str,
+        operation: str,
+        request_id: str = "",
+        status: str = "ok",
+        error: str = "",
+        at: datetime | None = None,
+    ) -> bytes:
+        """Format an audit entry without writing it; returns the JSONL line.
+
+        Callers collect lines and hand them to :meth:`append_entries`.
+        Entries without *error* whose fields need no JSON escaping (hex
+        digests, operation names, request ids) are rendered from a bytes
+        template; anything else goes through the JSON encoder.  *at* (UTC)
+        lets callers stamp related records from one clock read; it
+        defaults to now.
+        """
+        timestamp = (
+            self._timestamp()
+            if at is None
+            else at.isoformat(timespec="milliseconds")
+        )
+        if not error and not _NEEDS_ESCAPE.search(
+            operation + status + state_hash + request_id
+        ):
+            line = _ENTRY_TMPL % (
+                timestamp.encode("ascii"),
+                operation.encode("utf-8"),
+                status.encode("utf-8"),
+                state_hash.encode("utf-8"),
+                request_id.encode("utf-8"),
+            )
+        else:
+            entry: dict[str, str] = {
+                "timestamp": timestamp,
+                "operation": operation,
+                "status": status,
+                "hash": state_hash,
+                "request_id": request_id,
+            }
+            if error:
+                entry["error"] = error
+            line = json_codec.dumps(entry) + b"\n"
 
         logger.info(
             "Audit: op=%s status=%s hash=%s req=%s",
@@ -61,3 +388,67 @@ class HashManager:
             state_hash[:12] if state_hash else "(empty)",
             request_id,
         )
+        return line
+
+    def append_entries(self, lines: bytes, sync: bool = True) -> None:
+        """Append pre-formatted JSONL *lines* with a single write (+ fsync).
+
+        ``sync=False`` skips the fsync; the caller syncs later with
+        ``flush(fsync=True)``.
+        """
+        if not lines:
+            return
+        with self._mu:
+            if self._batch_depth > 0:
+                self._pending += lines
+            else:
+                self._write(lines, self._durable and sync)
+
+    def _timestamp(self) -> str:
+        """Current UTC time as ISO 8601 with millisecond precision.
+
+        The formatted string is reused for entries logged within the same
+        millisecond.
+        """
+        ms = int(time.time() * 1000)
+        cached_ms, cached = self._ts_cache
+        if ms != cached_ms:
+            cached = datetime.fromtimestamp(ms / 1000, timezone.utc).isoformat(
+                timespec="milliseconds"
+            )
+            self._ts_cache = (ms, cached)
+        return cached
+
+    def _write_pending(self, fsync: bool) -> None:
+        """Write the batch buffer (caller holds ``_mu``)."""
+        if self._pending:
+            data = bytes(self._pending)
+            self._pending.clear()
+            self._write(data, fsync)
+
+    def _write(self, data: bytes, fsync: bool) -> None:
+        """Append *data* to the audit log (caller holds ``_mu``)."""
+        if self._background:
+            if self._writer is None:
+                self._writer = _AuditWriter(self._audit_log_path)
+                self._writer_finalizer = weakref.finalize(
+                    self, self._writer.close
+                )
+            self._writer.put(data, fsync)
+            return
+        fd = self._open()
+        _write_all(fd, data)
+        if fsync:
+            os.fsync(fd)
+
+    def _open(self) -> int:
+        """Return the cached audit-log fd, opening it on first use."""
+        if self._fd is None:
+            self._audit_log_path.parent.mkdir(parents=True, exist_ok=True)
+            self._fd = os.open(
+                str(self._audit_log_path),
+                os.O_WRONLY | os.O_CREAT | os.O_APPEND,
+                0o644,
+            )
+            self._finalizer = weakref.finalize(self, os.close, self._fd)
+        return self._fd
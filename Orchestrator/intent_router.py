@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping
+from types import MappingProxyType
+
 from .exceptions import OrchestratorError
 
 
@@ -13,11 +16,12 @@ class UnknownTaskTypeError(OrchestratorError):
         super().__init__(f"No route registered for task type: {task_type!r}")
 
 
-_DEFAULT_ROUTES: dict[str, str] = {
+_DEFAULT_ROUTES_RAW: dict[str, str] = {
     "sheets": "sheets_agent",
     "analytics": "analytics_agent",
     "report": "report_agent",
 }
+_DEFAULT_ROUTES: Mapping[str, str] = MappingProxyType(_DEFAULT_ROUTES_RAW)
 
 
 class IntentRouter:
@@ -29,12 +33,25 @@ class IntentRouter:
         Optional custom routing table.  When *None*, the built-in default
         routes are used.  Any entries passed here are **merged** on top of
         the defaults.
+
+    Routers built without custom routes share the module-level default
+    table and copy it on the first :meth:`register_route` (copy-on-write).
     """
 
+    __slots__ = ("_routes", "_routes_view", "_owns_routes")
+
     def __init__(self, routes: dict[str, str] | None = None) -> None:
-        self._routes: dict[str, str] = dict(_DEFAULT_ROUTES)
-        if routes is not None:
-            self._routes.update(routes)
+        self._routes: dict[str, str]
+        self._routes_view: Mapping[str, str]
+        if routes is None:
+            # Shared, never mutated in place; see register_route().
+            self._routes = _DEFAULT_ROUTES_RAW
+            self._routes_view = _DEFAULT_ROUTES
+            self._owns_routes = False
+        else:
+            self._routes = {**_DEFAULT_ROUTES_RAW, **routes}
+            self._routes_view = MappingProxyType(self._routes)
+            self._owns_routes = True
 
     # ------------------------------------------------------------------
     # Public API
@@ -51,7 +68,16 @@ class IntentRouter:
         task_type = task.get("type")
         if not task_type or not isinstance(task_type, str):
             raise UnknownTaskTypeError(str(task_type) if task_type is not None else "")
+        return self.route_by_type(task_type)
 
+    def route_by_type(self, task_type: str) -> str:
+        """Return the agent identifier for a bare *task_type*.
+
+        Raises
+        ------
+        UnknownTaskTypeError
+            If *task_type* is not in the table.
+        """
         try:
             return self._routes[task_type]
         except KeyError:
@@ -59,9 +85,18 @@ class IntentRouter:
 
     def register_route(self, task_type: str, agent_id: str) -> None:
         """Add or overwrite a route at runtime."""
+        if not self._owns_routes:
+            self._routes = dict(self._routes)
+            self._routes_view = MappingProxyType(self._routes)
+            self._owns_routes = True
         self._routes[task_type] = agent_id
 
     @property
-    def routes(self) -> dict[str, str]:
-        """Return an immutable *copy* of the routing table."""
-        return dict(self._routes)
+    def routes(self) -> Mapping[str, str]:
+        """Return a read-only view of the routing table.
+
+        The view tracks later registrations, except that a router still
+        sharing the defaults switches to its own table on the first
+        :meth:`register_route`; re-read the property after registering.
+        """
+        return self._routes_view
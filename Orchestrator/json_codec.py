@@ -0,0 +1,52 @@
+"""JSON encoding/decoding with an optional orjson fast path.
+
+``orjson`` is used when installed; otherwise the stdlib ``json`` module
+produces equivalent output (compact separators, UTF-8, no ASCII escaping).
+Floats in exponent form may be spelled differently (``1e-6`` vs
+``1e-06``) but parse back to the same value.
+"""
+
+from __future__ import annotations
+
+import json
+from typing import Any, Callable
+
+_orjson_dumps: Callable[..., bytes] | None
+_orjson_loads: Callable[[Any], Any] | None
+try:
+    from orjson import OPT_INDENT_2, OPT_NON_STR_KEYS
+    from orjson import dumps as _orjson_dumps
+    from orjson import loads as _orjson_loads
+except ImportError:  # pragma: no cover - depends on environment
+    _orjson_dumps = None
+    _orjson_loads = None
+
+
+def dumps(obj: Any) -> bytes:
+    """Serialize *obj* to compact UTF-8 JSON bytes."""
+    if _orjson_dumps is not None:
+        return _orjson_dumps(obj)
+    return json.dumps(obj, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+
+
+def dumps_indent(obj: Any) -> str:
+    """Serialize *obj* to JSON text indented by two spaces."""
+    if _orjson_dumps is not None:
+        return _orjson_dumps(
+            obj, option=OPT_INDENT_2 | OPT_NON_STR_KEYS
+        ).decode("utf-8")
+    return json.dumps(obj, indent=2, ensure_ascii=False)
+
+
+def loads(data: bytes | bytearray | memoryview | str) -> Any:
+    """Parse JSON from UTF-8 bytes (or text).
+
+    Raises ``ValueError`` on invalid JSON or invalid UTF-8.
+    """
+    if _orjson_loads is not None:
+        return _orjson_loads(data)
+    if not isinstance(data, str):
+        data = str(data, "utf-8")
+    return json.loads(data)
@@ -1,12 +1,62 @@
-"""Pydantic models for the Orchestrator module."""
+"""Data models for the Orchestrator module.
+
+Slotted, frozen dataclasses: requests reach the Orchestrator already
+validated by the Controller, so no per-instance validation is done here.
+"""
 
 from __future__ import annotations
 
+import os
+import threading
+from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from uuid import uuid4
 
-from pydantic import BaseModel, Field
+
+class IdPool:
+    """Hand out random UUID4 hex strings from a pre-fetched random buffer.
+
+    One ``os.urandom`` call fills *chunk* ids; each id gets the RFC 4122
+    version-4 and variant bits, so it is interchangeable with
+    ``uuid4().hex``.
+    """
+
+    def __init__(self, chunk: int = 256) -> None:
+        self._chunk = chunk
+        self._mu = threading.Lock()
+        self._buf = b""
+        self._off = 0
+
+    def next_hex(self) -> str:
+        """Return the next 32-character UUID4 hex string."""
+        with self._mu:
+            if self._off >= len(self._buf):
+                self._buf = os.urandom(16 * self._chunk)
+                self._off = 0
+            raw = bytearray(self._buf[self._off:self._off + 16])
+            self._off += 16
+        raw[6] = (raw[6] & 0x0F) | 0x40
+        raw[8] = (raw[8] & 0x3F) | 0x80
+        return raw.hex()
+
+    def reset(self) -> None:
+        """Discard buffered randomness (a forked child must not reuse it)."""
+        with self._mu:
+            self._buf = b""
+            self._off = 0
+
+
+_ID_POOL = IdPool()
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_ID_POOL.reset)
+
+
+def _utc_now() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _new_request_id() -> str:
+    return _ID_POOL.next_hex()
 
 
 class HealthStatus(str, Enum):
@@ -17,7 +67,14 @@ class HealthStatus(str, Enum):
     DOWN = "down"
 
 
-class StateChangeItem(BaseModel):
+# Pre-bound members so hot paths skip the Enum class-attribute lookup.
+HEALTHY = HealthStatus.HEALTHY
+DEGRADED = HealthStatus.DEGRADED
+DOWN = HealthStatus.DOWN
+
+
+@dataclass(slots=True, frozen=True)
+class StateChangeItem:
     """A single state change within an update request."""
 
     section: str
@@ -29,43 +86,43 @@ class StateChangeItem(BaseModel):
     triggered_by: str
 
 
-class StateUpdateRequest(BaseModel):
+@dataclass(slots=True, frozen=True)
+class StateUpdateRequest:
     """Request to update STATE.md. Only accepted from origin='controller'."""
 
     origin: str
     changes: list[StateChangeItem]
     reason: str
-    request_id: str = Field(default_factory=lambda: uuid4().hex)
-    timestamp: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc)
-    )
+    request_id: str = field(default_factory=_new_request_id)
+    timestamp: datetime = field(default_factory=_utc_now)
 
 
-class ValidationResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class ValidationResult:
     """Result of state change validation."""
 
     valid: bool
-    errors: list[str] = Field(default_factory=list)
-    warnings: list[str] = Field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
+    warnings: list[str] = field(default_factory=list)
 
 
-class StateHealth(BaseModel):
+@dataclass(slots=True, frozen=True)
+class StateHealth:
     """Current health of the Orchestrator state."""
 
     status: HealthStatus
     last_check: datetime
     last_update: datetime | None = None
     state_hash: str = ""
-    errors: list[str] = Field(default_factory=list)
+    errors: list[str] = field(default_factory=list)
 
 
-class StateUpdateResult(BaseModel):
+@dataclass(slots=True, frozen=True)
+class StateUpdateResult:
     """Result of a state update operation."""
 
     success: bool
     request_id: str
     state_hash: str = ""
-    errors: list[str] = Field(default_factory=list)
-    timestamp: datetime = Field(
-        default_factory=lambda: datetime.now(timezone.utc)
-    )
+    errors: list[str] = field(default_factory=list)
+    timestamp: datetime = field(default_factory=_utc_now)
@@ -6,6 +6,8 @@ Authorizes requests (only 'controller' allowed) and delegates to StateManager.
 from __future__ import annotations
 
 import logging
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
 from .exceptions import UnauthorizedAccessError
@@ -83,7 +85,19 @@ class Orchestrator:
             request.request_id,
             len(request.changes),
         )
-        return self._sm.update_state(request)
+        with self._with_durable_batch():
+            return self._sm.update_state(request)
+
+    @contextmanager
+    def _with_durable_batch(self) -> Iterator[None]:
+        """Coalesce audit-trail fsyncs across the enclosed updates.
+
+        Nested batches commit once, when the outermost one exits; wrap
+        several :meth:`handle_state_update` calls to sync the audit files
+        once for all of them.
+        """
+        with self._sm.durable_batch():
+            yield
 
     def verify_state_integrity(self) -> ValidationResult:
         """Verify current STATE.md consistency.
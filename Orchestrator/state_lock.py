@@ -1,36 +1,77 @@
-"""File-based state lock using portalocker for crash-safe concurrency."""
+"""File-based state lock using OS advisory locks for crash-safe concurrency.
+
+POSIX uses ``fcntl.flock``; Windows uses ``msvcrt.locking`` on the first
+byte of the lock file.  The kernel drops the lock if the process dies.
+"""
 
 from __future__ import annotations
 
 import logging
 import os
+import sys
 import threading
+import time
+import weakref
 from pathlib import Path
 from types import TracebackType
 
-import portalocker
-
 from .exceptions import StateLockError
 
 logger = logging.getLogger(__name__)
 
+# Sleep between non-blocking attempts while waiting for the file lock.
+_POLL_INTERVAL = 0.005
+
+if sys.platform == "win32":
+    import msvcrt
+
+    def _try_lock(fd: int) -> bool:
+        os.lseek(fd, 0, os.SEEK_SET)
+        try:
+            msvcrt.locking(fd, msvcrt.LK_NBLCK, 1)
+        except OSError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        os.lseek(fd, 0, os.SEEK_SET)
+        msvcrt.locking(fd, msvcrt.LK_UNLCK, 1)
+
+else:
+    import fcntl
+
+    def _try_lock(fd: int) -> bool:
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            return False
+        return True
+
+    def _unlock(fd: int) -> None:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
 
 class StateLock:
     """Exclusive file lock for STATE.md writes.
 
-    Thread-safe via threading.Lock + OS-level file lock via portalocker.
-    Supports context manager protocol.
+    Thread-safe via threading.Lock + OS-level file lock.  The lock file is
+    opened on first acquire and kept open; releasing only drops the OS lock
+    (the file is never unlinked, which would let two processes lock
+    different inodes).  Supports context manager protocol.
     """
 
     def __init__(self, lock_path: Path, timeout: float = 30.0) -> None:
         self._lock_path = lock_path
         self._timeout = timeout
         self._mu = threading.RLock()
-        self._lock: portalocker.Lock | None = None
+        self._fd: int | None = None
+        self._finalizer: weakref.finalize[[int], StateLock] | None = None
         self._acquired = False
+        self._pid_written = False
 
     def acquire_lock(self) -> None:
         """Acquire exclusive lock. Blocks until timeout."""
+        deadline = time.monotonic() + self._timeout
         acquired_thread = self._mu.acquire(timeout=self._timeout)
         if not acquired_thread:
             raise StateLockError(
@@ -43,54 +84,52 @@ class StateLock:
             return
 
         try:
-            self._lock_path.parent.mkdir(parents=True, exist_ok=True)
-            lock = portalocker.Lock(
-                str(self._lock_path),
-                mode="w",
-                timeout=self._timeout,
-                flags=portalocker.LOCK_EX,
-            )
-            lock.acquire()
-            # Write PID for crash diagnostics.
-            fh = lock.fh
-            if fh is not None:
-                pid_str: str = str(os.getpid())
-                fh.write(pid_str)  # type: ignore[call-overload]
-                fh.flush()
-            self._lock = lock
+            fd = self._open()
+            # Fast path: uncontended acquire is one non-blocking flock.
+            if not _try_lock(fd):
+                self._wait_for_lock(fd, deadline)
+            if not self._pid_written:
+                # Write PID once for crash diagnostics.
+                os.ftruncate(fd, 0)
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.write(fd, str(os.getpid()).encode("ascii"))
+                self._pid_written = True
             self._acquired = True
             logger.info(
                 "Lock acquired: %s (pid=%d)", self._lock_path, os.getpid()
             )
-        except portalocker.LockException as exc:
-            self._lock = None
+        except StateLockError:
             self._mu.release()
-            raise StateLockError(
-                f"File lock failed on {self._lock_path}: {exc}"
-            ) from exc
+            raise
         except OSError as exc:
-            self._lock = None
             self._mu.release()
             raise StateLockError(
                 f"Cannot open lock file {self._lock_path}: {exc}"
             ) from exc
 
+    def _wait_for_lock(self, fd: int, deadline: float) -> None:
+        """Poll for the file lock under contention until *deadline*."""
+        while True:
+            if time.monotonic() >= deadline:
+                raise StateLockError(
+                    f"File lock failed on {self._lock_path}: "
+                    f"timeout after {self._timeout}s"
+                )
+            time.sleep(_POLL_INTERVAL)
+            if _try_lock(fd):
+                return
+
     def release_lock(self) -> None:
         """Release lock. Safe to call when not held."""
         if not self._acquired:
             return
 
         try:
-            if self._lock is not None:
+            if self._fd is not None:
                 try:
-                    self._lock.release()
-                except Exception:  # noqa: BLE001
-                    logger.debug("portalocker release failed (ignored)")
-                self._lock = None
-            try:
-                self._lock_path.unlink(missing_ok=True)
-            except OSError:
-                pass
+                    _unlock(self._fd)
+                except OSError:
+                    logger.debug("File unlock failed (ignored)")
             self._acquired = False
             logger.info("Lock released: %s", self._lock_path)
         finally:
@@ -99,11 +138,28 @@ class StateLock:
             except RuntimeError:
                 pass  # Not held — defensive.
 
+    def close(self) -> None:
+        """Release the lock if held and close the lock file fd."""
+        self.release_lock()
+        if self._finalizer is not None:
+            self._finalizer()
+            self._finalizer = None
+        self._fd = None
+
     @property
     def is_acquired(self) -> bool:
         """Whether this lock instance currently holds the lock."""
         return self._acquired
 
+    def _open(self) -> int:
+        """Return the lock file fd, opening it on first use."""
+        if self._fd is None:
+            self._lock_path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(str(self._lock_path), os.O_RDWR | os.O_CREAT, 0o644)
+            self._fd = fd
+            self._finalizer = weakref.finalize(self, os.close, fd)
+        return self._fd
+
     def __enter__(self) -> StateLock:
         self.acquire_lock()
         return self
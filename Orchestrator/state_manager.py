@@ -16,16 +16,24 @@ On error: restore backup → log → MISTAKE.md → release lock.
 
 from __future__ import annotations
 
-import json
 import logging
 import os
+import operator
 import tempfile
+import threading
+import weakref
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime, timezone
 from pathlib import Path
 
+from . import json_codec
 from .exceptions import OrchestratorError, StateValidationError
 from .hash_manager import HashManager
 from .models import (
+    DEGRADED,
+    DOWN,
+    HEALTHY,
     HealthStatus,
     StateChangeItem,
     StateHealth,
@@ -39,17 +47,41 @@ from .state_processor import (
     VerifyResult,
     apply_state_changes,
     backup_state as _backup_state,
-    parse_state,
+    clone_document as _clone_doc,
+    link_or_copy as _link_or_copy,
+    parse_state_from_bytes,
+    read_expected_checksum as _read_expected_checksum,
     render_state,
-    verify_state as _verify_state,
+    verify_document as _verify_document,
+    write_all as _write_all,
 )
 from .state_validator import StateValidator
 
 logger = logging.getLogger(__name__)
 
+# Append-only logs only need data + size flushed; fdatasync skips the
+# extra metadata journal flush where the platform has it.
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# Read size past the fstat'd length when STATE.md is read to EOF.
+_READ_CHUNK = 1 << 16
+
+# Linux-only flag for an unnamed temp file; 0 elsewhere disables that path.
+_O_TMPFILE: int = getattr(os, "O_TMPFILE", 0)
+
 
 class StateManager:
-    """Manages STATE.md with locking, backup, validation, and audit trail."""
+    """Manages STATE.md with locking, backup, validation, and audit trail.
+
+    With ``durable=False`` no file or directory is fsync'd (STATE.md,
+    audit-trail appends, audit log).  Writes stay atomic — STATE.md is
+    still replaced by rename — but recent updates may be lost on power
+    failure.  Meant for tests and ephemeral runs.
+
+    With ``background_audit=True`` audit-log entries are written by the
+    HashManager's writer thread, so updates drop the lock without waiting
+    for that write; :meth:`close` drains the queue.
+    """
 
     def __init__(
         self,
@@ -61,45 +93,110 @@ class StateManager:
         mistake_path: Path,
         audit_log_path: Path,
         lock_timeout: float = 30.0,
+        durable: bool = True,
+        background_audit: bool = False,
     ) -> None:
         self._state_path = state_path
         self._backup_dir = backup_dir
+        self._durable = durable
         self._lock = StateLock(lock_path, timeout=lock_timeout)
         self._validator = StateValidator()
-        self._hash_manager = HashManager(audit_log_path)
+        self._hash_manager = HashManager(
+            audit_log_path, durable=durable, background=background_audit
+        )
         self._health_path = health_path
         self._changelog_path = changelog_path
         self._mistake_path = mistake_path
+        self._batch_mu = threading.Lock()
+        self._batch_depth = 0
+        self._audit_batch: _AuditBatch | None = None
+        # Cached read-only fd on STATE.md, keyed by (st_dev, st_ino) so an
+        # atomic replace of the file is noticed and the fd reopened.
+        self._state_fd: int | None = None
+        self._state_ident: tuple[int, int] = (-1, -1)
+        # Last parsed document + content hash, keyed by
+        # (st_dev, st_ino, st_mtime_ns, st_size) of STATE.md.
+        self._parse_cache: (
+            tuple[tuple[int, int, int, int], str, StateDocument] | None
+        ) = None
+        self._state_fd_finalizer: weakref.finalize[[int], StateManager] | None = None
+        # O_APPEND fds for HEALTH.md / CHANGELOG.md / MISTAKE.md.
+        self._append_files = _AppendFiles()
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
+    @property
+    def hash_manager(self) -> HashManager:
+        """HashManager used for state hashes and the audit log."""
+        return self._hash_manager
+
+    @contextmanager
+    def durable_batch(self) -> Iterator[None]:
+        """Defer audit-trail fsyncs until the outermost batch exits.
+
+        Each update still appends its audit-log, HEALTH.md, CHANGELOG.md
+        and MISTAKE.md entries before it releases the lock, so the files
+        stay in STATE.md order; only the fsyncs are held back, and on exit
+        each touched file gets a single one.  STATE.md itself is still
+        fsync'd before its atomic rename.
+        """
+        with self._batch_mu:
+            self._batch_depth += 1
+            if self._batch_depth == 1:
+                self._audit_batch = _AuditBatch(
+                    self._hash_manager, self._append_files, self._durable
+                )
+        try:
+            yield
+        finally:
+            with self._batch_mu:
+                self._batch_depth -= 1
+                batch: _AuditBatch | None = None
+                if self._batch_depth == 0:
+                    batch, self._audit_batch = self._audit_batch, None
+            if batch is not None:
+                batch.flush()
+
     def load_state(self) -> StateDocument:
-        """Load and parse STATE.md."""
-        return parse_state(self._state_path)
+        """Load and parse STATE.md.
+
+        Re-parses only when STATE.md's identity, mtime or size changed;
+        the caller gets its own copy and may mutate it.
+        """
+        return _clone_doc(self._load_cached()[1])
+
+    def close(self) -> None:
+        """Close cached file descriptors (STATE.md, audit files, lock)."""
+        self._close_state_fd()
+        self._append_files.close()
+        self._hash_manager.close()
+        self._lock.close()
 
     def save_state(self, doc: StateDocument) -> str:
         """Render and atomically write STATE.md. Returns the SHA-256 hash."""
-        content = render_state(doc)
-        state_hash = self._hash_manager.compute_hash(content)
+        data = render_state(doc).encode("utf-8")
+        state_hash = self._hash_manager.compute_hash_bytes(data)
 
         # Atomic write: temp file → fsync → rename.
         self._state_path.parent.mkdir(parents=True, exist_ok=True)
-        fd, tmp = tempfile.mkstemp(
-            dir=str(self._state_path.parent), suffix=".tmp"
-        )
-        try:
-            os.write(fd, content.encode("utf-8"))
-            os.fsync(fd)
-        finally:
-            os.close(fd)
-        Path(tmp).replace(self._state_path)
+        tmp = _write_temp(self._state_path, data, self._durable)
+        tmp.replace(self._state_path)
+        if self._durable:
+            # Persist the rename itself (directory entry).
+            _fsync_dir(self._state_path.parent)
 
         # Write checksum companion file.
         hash_path = self._state_path.with_suffix(".md.hash")
         hash_path.write_text(state_hash + "\n", encoding="utf-8")
 
+        # Cache what was written, not *doc*: rendering fills missing
+        # columns with "—" and cell text containing "|" re-parses apart.
+        st = os.stat(self._state_path)
+        self._parse_cache = (
+            _stat_key(st), state_hash, parse_state_from_bytes(data)
+        )
         return state_hash
 
     def backup_state(self) -> Path:
@@ -108,9 +205,15 @@ class StateManager:
         return _backup_state(self._state_path, self._backup_dir)
 
     def restore_state(self, backup_path: Path) -> None:
-        """Restore STATE.md from a backup file."""
-        content = backup_path.read_text(encoding="utf-8")
-        self._state_path.write_text(content, encoding="utf-8")
+        """Restore STATE.md from a backup file.
+
+        The backup is linked (or copied) beside STATE.md and renamed over
+        it, so the swap is atomic and the backup itself is kept.
+        """
+        tmp = self._state_path.with_name(self._state_path.name + ".restore")
+        _link_or_copy(backup_path, tmp)
+        self._parse_cache = None
+        tmp.replace(self._state_path)
         logger.info("State restored from %s", backup_path)
 
     def update_state(
@@ -123,8 +226,24 @@ class StateManager:
         """
         backup_path: Path | None = None
         lock_acquired = False
+        # Audit/HEALTH/CHANGELOG/MISTAKE entries are written before the
+        # lock drops.  Inside a durable batch their fsyncs wait for the
+        # batch to exit; otherwise a per-update batch syncs them here.
+        shared = self._audit_batch
+        batch = (
+            shared
+            if shared is not None
+            else _AuditBatch(
+                self._hash_manager, self._append_files, self._durable
+            )
+        )
 
         try:
+            # An empty request can never pass validation: reject it before
+            # touching the lock, the backup or STATE.md.
+            if not request.changes:
+                raise StateValidationError(["No changes provided"])
+
             # 1 — acquire lock
             self._lock.acquire_lock()
             lock_acquired = True
@@ -148,16 +267,22 @@ class StateManager:
             # 5 — save file (atomic)
             state_hash = self.save_state(current)
 
-            # 6 — log hash to audit
-            self._hash_manager.log_hash(
-                state_hash, "update", request.request_id
+            # 6 — log hash to audit (one clock read for steps 6-8)
+            now = datetime.now(timezone.utc)
+            ts = now.isoformat()
+            batch.add_audit(
+                self._hash_manager.log_hash_buffered(
+                    state_hash, "update", request.request_id, at=now
+                )
             )
 
             # 7 — update HEALTH.md
-            self._append_health(HealthStatus.HEALTHY, state_hash)
+            self._append_health(batch, HEALTHY, state_hash, ts=ts)
 
             # 8 — update CHANGELOG.md
-            self._append_changelog(request, len(request.changes))
+            self._append_changelog(
+                batch, request, len(request.changes), ts=ts
+            )
 
             return StateUpdateResult(
                 success=True,
@@ -166,7 +291,9 @@ class StateManager:
             )
 
         except OrchestratorError as exc:
-            self._handle_error(backup_path, request.request_id, str(exc))
+            self._handle_error(
+                batch, backup_path, request.request_id, str(exc)
+            )
             return StateUpdateResult(
                 success=False,
                 request_id=request.request_id,
@@ -174,16 +301,31 @@ class StateManager:
             )
 
         except Exception as exc:
-            self._handle_error(backup_path, request.request_id, str(exc))
+            self._handle_error(
+                batch, backup_path, request.request_id, str(exc)
+            )
             raise
 
         finally:
-            if lock_acquired:
-                self._lock.release_lock()
+            try:
+                if batch is shared:
+                    batch.write()
+                else:
+                    batch.flush()
+            finally:
+                if lock_acquired:
+                    self._lock.release_lock()
 
     def verify_integrity(self) -> VerifyResult:
-        """Verify STATE.md consistency and integrity."""
-        return _verify_state(self._state_path)
+        """Verify STATE.md consistency and integrity.
+
+        Shares the parse cache with :meth:`load_state` and
+        :meth:`health_check`, so an unchanged file is not re-parsed.
+        """
+        try:
+            return self._read_and_verify()[1]
+        except FileNotFoundError:
+            return VerifyResult(ok=False, errors=["STATE.md not found"])
 
     def health_check(self) -> StateHealth:
         """Return current health status."""
@@ -192,26 +334,22 @@ class StateManager:
         try:
             if not self._state_path.exists():
                 return StateHealth(
-                    status=HealthStatus.DOWN,
+                    status=DOWN,
                     last_check=now,
                     errors=["STATE.md not found"],
                 )
 
-            content = self._state_path.read_text(encoding="utf-8")
-            state_hash = self._hash_manager.compute_hash(content)
-
-            verify = self.verify_integrity()
-            if not verify.ok:
+            state_hash, verify, doc = self._read_and_verify()
+            if not verify.ok or doc is None:
                 return StateHealth(
-                    status=HealthStatus.DEGRADED,
+                    status=DEGRADED,
                     last_check=now,
                     state_hash=state_hash,
                     errors=list(verify.errors),
                 )
 
-            doc = self.load_state()
             return StateHealth(
-                status=HealthStatus.HEALTHY,
+                status=HEALTHY,
                 last_check=now,
                 last_update=_parse_iso(doc.last_updated),
                 state_hash=state_hash,
@@ -219,7 +357,7 @@ class StateManager:
 
         except Exception as exc:
             return StateHealth(
-                status=HealthStatus.DOWN,
+                status=DOWN,
                 last_check=now,
                 errors=[str(exc)],
             )
@@ -228,8 +366,91 @@ class StateManager:
     # Internal helpers
     # ------------------------------------------------------------------
 
+    def _read_and_verify(
+        self,
+    ) -> tuple[str, VerifyResult, StateDocument | None]:
+        """Hash, parse and verify STATE.md from a single (cached) read.
+
+        Returns (content hash, verification result, parsed doc); the doc is
+        None when STATE.md cannot be parsed.
+        """
+        try:
+            state_hash, doc = self._load_cached()
+        except Exception as exc:
+            state_hash = (
+                self._companion_hash()
+                or self._hash_manager.compute_hash_file(self._state_path)
+            )
+            return (
+                state_hash,
+                VerifyResult(ok=False, errors=[f"Parse error: {exc}"]),
+                None,
+            )
+        expected = _read_expected_checksum(self._state_path)
+        return state_hash, _verify_document(doc, state_hash, expected), doc
+
+    def _companion_hash(self) -> str | None:
+        """Hash from ``STATE.md.hash`` if written no earlier than STATE.md."""
+        hash_path = self._state_path.with_suffix(".md.hash")
+        try:
+            if hash_path.stat().st_mtime_ns < self._state_path.stat().st_mtime_ns:
+                return None
+            return hash_path.read_text(encoding="utf-8").strip() or None
+        except OSError:
+            return None
+
+    def _load_cached(self) -> tuple[str, StateDocument]:
+        """Return (content hash, parsed doc) of STATE.md, re-parsing on change.
+
+        The returned document is shared with the cache: do not mutate it.
+        """
+        st = os.stat(self._state_path)
+        cached = self._parse_cache
+        if cached is not None and cached[0] == _stat_key(st):
+            return cached[1], cached[2]
+
+        fst, data = self._read_state_bytes(st)
+        state_hash = self._hash_manager.compute_hash_bytes(data)
+        doc = parse_state_from_bytes(data)
+        self._parse_cache = (_stat_key(fst), state_hash, doc)
+        return state_hash, doc
+
+    def _read_state_bytes(
+        self, st: os.stat_result
+    ) -> tuple[os.stat_result, bytes]:
+        """Read STATE.md through a cached fd; return its fstat and bytes.
+
+        *st* (a stat of the path) only decides whether the cached fd is
+        stale.  Identity, size and cache key come from ``fstat`` of the fd
+        actually read, so a replace between stat and open is not cached
+        under the old file's key; reads continue until EOF.
+        """
+        ident = (st.st_dev, st.st_ino)
+        if self._state_fd is None or ident != self._state_ident:
+            self._close_state_fd()
+            fd = os.open(str(self._state_path), os.O_RDONLY)
+            self._state_fd = fd
+            self._state_fd_finalizer = weakref.finalize(self, os.close, fd)
+        fd = self._state_fd
+        fst = os.fstat(fd)
+        self._state_ident = (fst.st_dev, fst.st_ino)
+        data = os.pread(fd, fst.st_size, 0)
+        while True:
+            more = os.pread(fd, _READ_CHUNK, len(data))
+            if not more:
+                return fst, data
+            data += more
+
+    def _close_state_fd(self) -> None:
+        if self._state_fd_finalizer is not None:
+            self._state_fd_finalizer()
+            self._state_fd_finalizer = None
+        self._state_fd = None
+        self._state_ident = (-1, -1)
+
     def _handle_error(
         self,
+        batch: _AuditBatch,
         backup_path: Path | None,
         request_id: str,
         error_msg: str,
@@ -241,35 +462,42 @@ class StateManager:
             except Exception as restore_exc:
                 logger.critical("Backup restore failed: %s", restore_exc)
 
-        self._hash_manager.log_hash(
-            "", "update", request_id, status="error", error=error_msg
+        now = datetime.now(timezone.utc)
+        ts = now.isoformat()
+        batch.add_audit(
+            self._hash_manager.log_hash_buffered(
+                "", "update", request_id, status="error", error=error_msg, at=now
+            )
         )
-        self._append_mistake(request_id, error_msg)
-        self._append_health(HealthStatus.DEGRADED, "", errors=[error_msg])
+        self._append_mistake(batch, request_id, error_msg, ts=ts)
+        self._append_health(batch, DEGRADED, "", errors=[error_msg], ts=ts)
 
     def _append_health(
         self,
+        batch: _AuditBatch,
         status: HealthStatus,
         state_hash: str,
         errors: list[str] | None = None,
+        ts: str | None = None,
     ) -> None:
-        """Append JSON entry to HEALTH.md."""
+        """Append JSON entry to HEALTH.md (*ts* defaults to now)."""
         entry = {
-            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "timestamp": ts or datetime.now(timezone.utc).isoformat(),
             "status": status.value,
             "state_hash": state_hash,
             "errors": errors or [],
         }
-        _safe_append(
-            self._health_path,
-            json.dumps(entry, ensure_ascii=False) + "\n",
-        )
+        batch.add(self._health_path, json_codec.dumps(entry) + b"\n")
 
     def _append_changelog(
-        self, request: StateUpdateRequest, change_count: int
+        self,
+        batch: _AuditBatch,
+        request: StateUpdateRequest,
+        change_count: int,
+        ts: str | None = None,
     ) -> None:
-        """Append markdown entry to CHANGELOG.md."""
-        now = datetime.now(timezone.utc).isoformat()
+        """Append markdown entry to CHANGELOG.md (*ts* defaults to now)."""
+        now = ts or datetime.now(timezone.utc).isoformat()
         entry = (
             f"\n## [{now}] {request.request_id}\n"
             f"- **operation**: state_update\n"
@@ -277,18 +505,81 @@ class StateManager:
             f"- **changes**: {change_count}\n"
             f"- **reason**: {request.reason}\n"
         )
-        _safe_append(self._changelog_path, entry)
+        batch.add(self._changelog_path, entry.encode("utf-8"))
 
-    def _append_mistake(self, request_id: str, error_msg: str) -> None:
-        """Append markdown entry to MISTAKE.md."""
-        now = datetime.now(timezone.utc).isoformat()
+    def _append_mistake(
+        self,
+        batch: _AuditBatch,
+        request_id: str,
+        error_msg: str,
+        ts: str | None = None,
+    ) -> None:
+        """Append markdown entry to MISTAKE.md (*ts* defaults to now)."""
+        now = ts or datetime.now(timezone.utc).isoformat()
         entry = (
             f"\n## [{now}] {request_id}\n"
             f"- **error**: {error_msg}\n"
             f"- **operation**: state_update\n"
             f"- **remediation**: Review change validity and retry\n"
         )
-        _safe_append(self._mistake_path, entry)
+        batch.add(self._mistake_path, entry.encode("utf-8"))
+
+
+class _AuditBatch:
+    """Buffered audit-log / HEALTH.md / CHANGELOG.md / MISTAKE.md appends.
+
+    Entries are grouped per file.  :meth:`write` appends them with one
+    write per touched file and no sync, remembering what it touched;
+    :meth:`flush` writes whatever is left, then (when *durable*) syncs
+    each touched file once.
+    """
+
+    def __init__(
+        self,
+        hash_manager: HashManager,
+        files: _AppendFiles,
+        durable: bool = True,
+    ) -> None:
+        self._hash_manager = hash_manager
+        self._files = files
+        self._durable = durable
+        self._mu = threading.Lock()
+        self._audit = bytearray()
+        self._buf: dict[Path, list[bytes]] = {}
+        self._unsynced: set[Path] = set()
+        self._audit_unsynced = False
+
+    def add(self, path: Path, content: bytes) -> None:
+        with self._mu:
+            self._buf.setdefault(path, []).append(content)
+
+    def add_audit(self, line: bytes) -> None:
+        with self._mu:
+            self._audit += line
+
+    def write(self) -> None:
+        """Append the buffered entries now, leaving the fsyncs for later."""
+        with self._mu:
+            buf, self._buf = self._buf, {}
+            audit, self._audit = bytes(self._audit), bytearray()
+            self._unsynced.update(buf)
+            self._audit_unsynced |= bool(audit)
+        self._hash_manager.append_entries(audit, sync=False)
+        for path, parts in buf.items():
+            self._files.append(path, b"".join(parts), sync=False)
+
+    def flush(self) -> None:
+        """Write the buffered entries and sync every file touched so far."""
+        self.write()
+        with self._mu:
+            paths, self._unsynced = self._unsynced, set()
+            audit, self._audit_unsynced = self._audit_unsynced, False
+        if not self._durable:
+            return
+        if audit:
+            self._hash_manager.flush(fsync=True)
+        for path in paths:
+            self._files.sync(path)
 
 
 # ------------------------------------------------------------------
@@ -296,31 +587,148 @@ class StateManager:
 # ------------------------------------------------------------------
 
 
-def _safe_append(path: Path, content: str) -> None:
-    """Append content to file with fsync. Creates parent dirs if missing."""
-    path.parent.mkdir(parents=True, exist_ok=True)
-    fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND)
+class _AppendFiles:
+    """Long-lived ``O_APPEND`` fds for the markdown audit files.
+
+    Each file is opened on first append and kept open.  Before every
+    append the path is stat'ed; if it no longer names the open inode
+    (log rotation, deletion) the fd is reopened.  Remaining fds are closed
+    by :meth:`close` or, failing that, at garbage collection / exit.
+    """
+
+    def __init__(self) -> None:
+        self._mu = threading.Lock()
+        # path -> (fd, (st_dev, st_ino)) of the open file.
+        self._fds: dict[Path, tuple[int, tuple[int, int]]] = {}
+        self._finalizer = weakref.finalize(self, _close_fds, self._fds)
+
+    def append(self, path: Path, content: bytes, sync: bool = True) -> None:
+        """Append *content* with one write; fdatasync it when *sync*."""
+        with self._mu:
+            fd = self._fd_for(path)
+            _write_all(fd, content)
+            if sync:
+                _fdatasync(fd)
+
+    def sync(self, path: Path) -> None:
+        """fdatasync the fd last used to append to *path*, if still open."""
+        with self._mu:
+            cached = self._fds.get(path)
+            if cached is not None:
+                _fdatasync(cached[0])
+
+    def close(self) -> None:
+        with self._mu:
+            _close_fds(self._fds)
+
+    def _fd_for(self, path: Path) -> int:
+        """Return an fd on the file currently at *path* (caller holds ``_mu``)."""
+        cached = self._fds.get(path)
+        if cached is not None:
+            fd, ident = cached
+            try:
+                st = os.stat(path)
+                if (st.st_dev, st.st_ino) == ident:
+                    return fd
+            except FileNotFoundError:
+                pass
+            del self._fds[path]
+            os.close(fd)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(str(path), os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+        st = os.fstat(fd)
+        self._fds[path] = (fd, (st.st_dev, st.st_ino))
+        return fd
+
+
+def _close_fds(fds: dict[Path, tuple[int, tuple[int, int]]]) -> None:
+    """Close and forget every fd in *fds*."""
+    while fds:
+        _, (fd, _ident) = fds.popitem()
+        try:
+            os.close(fd)
+        except OSError:
+            pass
+
+
+def _stat_key(st: os.stat_result) -> tuple[int, int, int, int]:
+    return (st.st_dev, st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _write_temp(target: Path, data: bytes, sync: bool) -> Path:
+    """Write *data* to a new file beside *target*; return its path.
+
+    On Linux the file is created unnamed (``O_TMPFILE``) and only linked
+    in as ``<target>.new`` once fully written, so a crash mid-write leaves
+    nothing behind.  Other platforms, and filesystems or sandboxes that
+    reject ``O_TMPFILE`` or the ``/proc`` link, fall back to ``mkstemp``.
+    """
+    if _O_TMPFILE:
+        new = _write_unnamed(target, data, sync)
+        if new is not None:
+            return new
+
+    fd, tmp = tempfile.mkstemp(dir=str(target.parent), suffix=".tmp")
     try:
-        os.write(fd, content.encode("utf-8"))
-        os.fsync(fd)
+        _write_all(fd, data)
+        if sync:
+            os.fsync(fd)
     finally:
         os.close(fd)
+    return Path(tmp)
+
+
+def _write_unnamed(target: Path, data: bytes, sync: bool) -> Path | None:
+    """``O_TMPFILE`` + ``linkat`` half of :func:`_write_temp`; None if unsupported."""
+    global _O_TMPFILE
+    try:
+        fd = os.open(str(target.parent), os.O_WRONLY | _O_TMPFILE, 0o600)
+    except OSError:
+        return None  # EOPNOTSUPP / EISDIR: no kernel or filesystem support.
+    new = target.with_name(target.name + ".new")
+    try:
+        _write_all(fd, data)
+        if sync:
+            os.fsync(fd)
+        new.unlink(missing_ok=True)  # Leftover from a crashed link.
+        try:
+            os.link(f"/proc/self/fd/{fd}", str(new))
+        except OSError:
+            # No /proc, or linkat refused (EXDEV, EPERM): process-wide, so
+            # stop paying for the wasted write on later saves.
+            _O_TMPFILE = 0
+            return None
+    finally:
+        os.close(fd)
+    return new
+
+
+def _fsync_dir(path: Path) -> None:
+    """fsync a directory so a rename inside it survives a crash (POSIX)."""
+    if os.name != "posix":
+        return
+    dfd = os.open(str(path), os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(dfd)
+    finally:
+        os.close(dfd)
+
+
+# StateChangeItem fields in StateChange's positional order, fetched in C.
+_change_fields = operator.attrgetter(
+    "section",
+    "field",
+    "column",
+    "old_value",
+    "new_value",
+    "reason",
+    "triggered_by",
+)
 
 
 def _to_state_changes(items: list[StateChangeItem]) -> list[StateChange]:
-    """Convert pydantic StateChangeItem list to dataclass StateChange list."""
-    return [
-        StateChange(
-            section=item.section,
-            field=item.field,
-            column=item.column,
-            old_value=item.old_value,
-            new_value=item.new_value,
-            reason=item.reason,
-            triggered_by=item.triggered_by,
-        )
-        for item in items
-    ]
+    """Convert a StateChangeItem list to the processor's StateChange list."""
+    return [StateChange(*_change_fields(item)) for item in items]
 
 
 def _parse_iso(ts: str) -> datetime | None:
@@ -5,23 +5,35 @@ Only the Controller writes to STATE.md via this processor.
 
 Operations:
     parse_state()    — Parse STATE.md into a structured StateDocument
+    parse_state_text() — Same, from already-read content
+    parse_state_from_bytes() — Same, from raw file bytes
+    parse_state_cached() — Same, memoized by content hash
     render_state()   — Render StateDocument back to markdown
     update_state()   — Apply state_changes and write with backup
-    backup_state()   — Copy STATE.md to a timestamped backup file
+    backup_state()   — Snapshot STATE.md to a timestamped backup (hardlink)
     verify_state()   — Check consistency between STATE.md and actual state
+    verify_document() — Same checks on an already-parsed document
     rebuild_state()  — Reconstruct STATE.md from Controller inbox reports
 """
 from __future__ import annotations
 
+import copy
 import hashlib
 import json
-import re
+import mmap
+import os
 import shutil
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any
 
+from . import json_codec
+
 # ---------------------------------------------------------------------------
 # Data structures
 # ---------------------------------------------------------------------------
@@ -31,6 +43,8 @@ _EMPTY_MARKERS = frozenset({
     "(nessuna direttiva pendente)",
     "(nessun cambio in attesa)",
 })
+# Common to every marker: one substring test rules out ordinary rows.
+_EMPTY_MARKER_STEM = "(nessun"
 
 
 @dataclass
@@ -75,6 +89,12 @@ class VerifyResult:
 # ---------------------------------------------------------------------------
 
 
+def _split_cells(line: str) -> list[str]:
+    """Split a markdown table line into its non-empty, stripped cells."""
+    # One strip per cell; faster than a regex findall on these short lines.
+    return [c for c in map(str.strip, line.split("|")) if c]
+
+
 def _parse_table(lines: list[str]) -> tuple[list[str], list[dict[str, str]]]:
     """Parse a markdown table into (headers, rows).
 
@@ -85,18 +105,21 @@ def _parse_table(lines: list[str]) -> tuple[list[str], list[dict[str, str]]]:
         return [], []
 
     # Header row
-    headers = [h.strip() for h in lines[0].split("|") if h.strip()]
+    headers = _split_cells(lines[0])
 
     # Skip separator row (|---|---|...)
     data_lines = lines[2:] if len(lines) > 2 else []
 
     rows: list[dict[str, str]] = []
     for line in data_lines:
-        cells = [c.strip() for c in line.split("|") if c.strip()]
+        cells = _split_cells(line)
         if not cells:
             continue
         # Skip empty placeholder rows
-        if any(marker in cells[0] for marker in _EMPTY_MARKERS):
+        first = cells[0]
+        if _EMPTY_MARKER_STEM in first and any(
+            marker in first for marker in _EMPTY_MARKERS
+        ):
             continue
         row = {}
         for i, header in enumerate(headers):
@@ -117,21 +140,20 @@ def _render_table(
         rows: List of dicts keyed by header name.
         empty_placeholder: Text for the first cell when no rows exist.
     """
-    lines: list[str] = []
-
-    # Header
-    lines.append("| " + " | ".join(headers) + " |")
-    lines.append("|" + "|".join("---" for _ in headers) + "|")
+    sep = " | "
+    head = [
+        "| " + sep.join(headers) + " |",
+        "|" + "|".join(["---"] * len(headers)) + "|",
+    ]
 
     if not rows and empty_placeholder:
         cells = [empty_placeholder] + ["—"] * (len(headers) - 1)
-        lines.append("| " + " | ".join(cells) + " |")
-    else:
-        for row in rows:
-            cells = [row.get(h, "—") for h in headers]
-            lines.append("| " + " | ".join(cells) + " |")
-
-    return "\n".join(lines)
+        return "\n".join(head + ["| " + sep.join(cells) + " |"])
+    # One comprehension + one join: no per-row append calls.
+    return "\n".join(
+        head + [f"| {sep.join([row.get(h, '—') for h in headers])} |"
+                for row in rows]
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -147,6 +169,9 @@ _SECTION_MAP: dict[str, str] = {
     "change history": "change_history",
 }
 
+_TS_HEADER = "### Timestamp Ultimo Aggiornamento"
+_METRICS_HEADER = "### System Metrics"
+
 
 def parse_state(state_path: Path) -> StateDocument:
     """Parse STATE.md into a :class:`StateDocument`.
@@ -157,58 +182,157 @@ def parse_state(state_path: Path) -> StateDocument:
     Returns:
         Parsed StateDocument with all sections populated.
     """
-    text = state_path.read_text(encoding="utf-8")
-    doc = StateDocument()
+    with _file_buffer(state_path) as buf:
+        return parse_state_text(_decode_state(buf))
 
-    # --- Frontmatter ---
-    fm_match = re.match(r"^---\n(.*?)\n---", text, re.DOTALL)
-    if fm_match:
-        for line in fm_match.group(1).splitlines():
-            if ":" in line:
-                key, _, value = line.partition(":")
-                doc.frontmatter[key.strip()] = value.strip().strip('"')
-
-    # --- Timestamp ---
-    ts_match = re.search(
-        r"### Timestamp Ultimo Aggiornamento\s*\n```\n(.*?)\n```",
-        text,
-        re.DOTALL,
-    )
-    if ts_match:
-        doc.last_updated = ts_match.group(1).strip()
-
-    # --- Markdown table sections ---
-    # Split by ### headers
-    section_pattern = re.compile(r"^### (.+)$", re.MULTILINE)
-    sections = section_pattern.split(text)
-
-    # sections alternates: [text_before, header1, body1, header2, body2, ...]
-    for i in range(1, len(sections) - 1, 2):
-        header = sections[i].strip().lower()
-        body = sections[i + 1]
-
-        attr_name = _SECTION_MAP.get(header)
-        if attr_name:
-            # Find table lines (lines starting with |)
-            table_lines = [
-                ln for ln in body.splitlines()
-                if ln.strip().startswith("|")
-            ]
-            if table_lines:
-                _, rows = _parse_table(table_lines)
-                setattr(doc, attr_name, rows)
-
-    # --- System Metrics (JSON block) ---
-    metrics_match = re.search(
-        r"### System Metrics.*?\n```json\n(.*?)\n```",
-        text,
-        re.DOTALL,
+
+def parse_state_from_bytes(data: bytes) -> StateDocument:
+    """Parse raw STATE.md bytes (UTF-8, any newline style).
+
+    Lets callers that already hold the bytes (e.g. to hash them) parse
+    without reading the file again.
+    """
+    return parse_state_text(_decode_state(data))
+
+
+def parse_state_cached(state_path: Path) -> StateDocument:
+    """Parse STATE.md, reusing the result for byte-identical content.
+
+    Results are memoized by the SHA-256 of the file bytes (FIFO, at most
+    ``_PARSE_CACHE_MAX`` entries); the caller gets its own copy and may
+    mutate it.
+    """
+    with _file_buffer(state_path) as buf:
+        return clone_document(_parse_bytes_cached(buf)[1])
+
+
+def parse_state_cache_clear() -> None:
+    """Drop every memoized :func:`parse_state_cached` result."""
+    with _PARSE_CACHE_LOCK:
+        _PARSE_CACHE.clear()
+
+
+def clone_document(doc: StateDocument) -> StateDocument:
+    """Copy *doc* deeply enough that mutating the copy leaves *doc* intact."""
+    return StateDocument(
+        frontmatter=dict(doc.frontmatter),
+        last_updated=doc.last_updated,
+        teams=[dict(r) for r in doc.teams],
+        agents=[dict(r) for r in doc.agents],
+        active_locks=[dict(r) for r in doc.active_locks],
+        pending_directives=[dict(r) for r in doc.pending_directives],
+        system_metrics=copy.deepcopy(doc.system_metrics),
+        candidate_changes=[dict(r) for r in doc.candidate_changes],
+        change_history=[dict(r) for r in doc.change_history],
     )
-    if metrics_match:
-        try:
-            doc.system_metrics = json.loads(metrics_match.group(1))
-        except json.JSONDecodeError:
-            doc.system_metrics = {}
+
+
+_PARSE_CACHE_MAX = 128
+_PARSE_CACHE: dict[str, StateDocument] = {}
+_PARSE_CACHE_LOCK = threading.Lock()
+
+
+def _parse_bytes_cached(
+    data: bytes | mmap.mmap,
+) -> tuple[str, StateDocument]:
+    """Return (SHA-256 hex of *data*, parsed doc); the doc is shared."""
+    digest = hashlib.sha256(data).hexdigest()
+    with _PARSE_CACHE_LOCK:
+        doc = _PARSE_CACHE.get(digest)
+    if doc is None:
+        doc = parse_state_text(_decode_state(data))
+        with _PARSE_CACHE_LOCK:
+            if len(_PARSE_CACHE) >= _PARSE_CACHE_MAX:
+                del _PARSE_CACHE[next(iter(_PARSE_CACHE))]
+            _PARSE_CACHE[digest] = doc
+    return digest, doc
+
+
+def _decode_state(data: bytes | mmap.mmap) -> str:
+    """Decode STATE.md bytes with ``read_text()``'s newline handling."""
+    text = str(data, "utf-8")
+    if "\r" in text:
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+    return text
+
+
+def parse_state_text(text: str) -> StateDocument:
+    """Parse STATE.md content (``\\n`` line endings) into a StateDocument.
+
+    Single pass over the lines: ``### `` headers switch the current section
+    (whose ``|`` rows are collected and parsed when the section ends), while
+    two small state machines pick up the fenced timestamp block and the
+    first fenced ``json`` block after the System Metrics header.
+    """
+    doc = StateDocument()
+    lines = text.split("\n")
+    n = len(lines)
+
+    # --- Frontmatter: "---" ... first line starting with "---" ---
+    if n > 2 and lines[0] == "---":
+        for end in range(2, n):
+            if lines[end].startswith("---"):
+                fm = doc.frontmatter
+                for line in lines[1:end]:
+                    key, sep, value = line.partition(":")
+                    if sep:
+                        fm[key.strip()] = value.strip().strip('"')
+                break
+
+    attr: str | None = None  # StateDocument attribute of the current section
+    table: list[str] = []
+    # Timestamp: 0 = scanning, 1 = header seen (blank lines allowed),
+    # 2 = inside the ``` block, 3 = done.  Metrics: 0 = scanning,
+    # 1 = header seen, 2 = inside the ```json block, 3 = done.
+    ts_state = ts_start = 0
+    m_state = m_start = 0
+
+    for i, line in enumerate(lines):
+        # --- Markdown table sections ---
+        if line.startswith("### ") and len(line) > 4:
+            if attr is not None and table:
+                setattr(doc, attr, _parse_table(table)[1])
+            attr = _SECTION_MAP.get(line[4:].strip().lower())
+            table = []
+        elif attr is not None and line.lstrip().startswith("|"):
+            table.append(line)
+
+        # --- Timestamp ---
+        if ts_state < 3:
+            if ts_state == 2:
+                if i > ts_start and line.startswith("```"):
+                    doc.last_updated = "\n".join(lines[ts_start:i]).strip()
+                    ts_state = 3
+            elif ts_state == 1 and not line.strip():
+                pass
+            elif ts_state == 1 and line == "```" and i + 1 < n:
+                ts_state = 2
+                ts_start = i + 1
+            elif line.startswith(_TS_HEADER) and not line[len(_TS_HEADER):].strip():
+                ts_state = 1
+            else:
+                ts_state = 0
+
+        # --- System Metrics (JSON block) ---
+        if m_state < 3:
+            if m_state == 2:
+                if i > m_start and line.startswith("```"):
+                    try:
+                        doc.system_metrics = json.loads(
+                            "\n".join(lines[m_start:i])
+                        )
+                    except json.JSONDecodeError:
+                        doc.system_metrics = {}
+                    m_state = 3
+            elif m_state == 1:
+                if line == "```json" and i + 1 < n:
+                    m_state = 2
+                    m_start = i + 1
+            elif _METRICS_HEADER in line:
+                m_state = 1
+
+    if attr is not None and table:
+        setattr(doc, attr, _parse_table(table)[1])
 
     return doc
 
@@ -316,7 +440,7 @@ def render_state(doc: StateDocument) -> str:
     parts.append("### System Metrics (Last Cycle)")
     parts.append("")
     parts.append("```json")
-    parts.append(json.dumps(doc.system_metrics, indent=2, ensure_ascii=False))
+    parts.append(json_codec.dumps_indent(doc.system_metrics))
     parts.append("```")
     parts.append("")
 
@@ -349,6 +473,21 @@ def render_state(doc: StateDocument) -> str:
 MAX_BACKUPS = 100
 
 
+def link_or_copy(src: Path, dst: Path) -> None:
+    """Make *dst* a hardlink to *src*, or a metadata-preserving copy.
+
+    A hardlink is O(1) and safe for STATE.md because every writer replaces
+    the file by rename, leaving the linked inode untouched.  Falls back to
+    ``shutil.copy2`` across filesystems or where links are not permitted.
+    An existing *dst* is replaced.
+    """
+    dst.unlink(missing_ok=True)
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
 def backup_state(state_path: Path, backup_dir: Path | None = None) -> Path:
     """Create a timestamped backup of STATE.md.
 
@@ -365,7 +504,7 @@ def backup_state(state_path: Path, backup_dir: Path | None = None) -> Path:
 
     ts = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
     backup_path = backup_dir / f".state_backup_{ts}.md"
-    shutil.copy2(state_path, backup_path)
+    link_or_copy(state_path, backup_path)
 
     # Cleanup old backups (keep last MAX_BACKUPS)
     backups = sorted(backup_dir.glob(".state_backup_*.md"))
@@ -418,6 +557,9 @@ def apply_state_changes(
         The mutated StateDocument (same object).
     """
     now = datetime.now(timezone.utc).isoformat()
+    # Section attr → key value → row, built on first use of each section.
+    indexes: dict[str, dict[str, dict[str, str]]] = {}
+    history_len = len(doc.change_history)
 
     for change in changes:
         # System metrics — update dict directly
@@ -433,23 +575,23 @@ def apply_state_changes(
             continue
 
         rows: list[dict[str, str]] = getattr(doc, attr_name)
+        index = indexes.get(attr_name)
+        if index is None:
+            index = indexes[attr_name] = _row_index(rows, key_col)
 
-        # Find existing row
-        target_row: dict[str, str] | None = None
-        for row in rows:
-            if row.get(key_col) == change.field:
-                target_row = row
-                break
-
-        if target_row is not None:
-            target_row[change.column] = change.new_value
-        else:
-            # Create new row with key field and the changed column
-            new_row = {key_col: change.field, change.column: change.new_value}
-            rows.append(new_row)
+        # Update the existing row, or create one with the key field and
+        # the changed column.
+        _upsert_row(
+            rows, key_col, change.field, {change.column: change.new_value},
+            index,
+        )
 
         _append_history(doc, now, change)
 
+    # Keep the last entries, trimming in place once for the whole batch.
+    if len(doc.change_history) > history_len:
+        del doc.change_history[:-_HISTORY_LIMIT]
+
     # Update timestamp
     doc.last_updated = now
     doc.frontmatter["last_updated"] = now[:10]
@@ -457,6 +599,10 @@ def apply_state_changes(
     return doc
 
 
+# Change history entries kept after apply_state_changes.
+_HISTORY_LIMIT = 10
+
+
 def _coerce_metric(value: str) -> int | float | str:
     """Try to coerce a string to int or float for metrics."""
     try:
@@ -472,7 +618,7 @@ def _coerce_metric(value: str) -> int | float | str:
 def _append_history(
     doc: StateDocument, timestamp: str, change: StateChange
 ) -> None:
-    """Append a change history entry, keeping only the last 10."""
+    """Append a change history entry (the caller trims the history)."""
     entry = {
         "Timestamp": timestamp,
         "Changed By": change.triggered_by,
@@ -481,9 +627,6 @@ def _append_history(
         "New Value": change.new_value,
     }
     doc.change_history.append(entry)
-    # Keep last 10
-    if len(doc.change_history) > 10:
-        doc.change_history = doc.change_history[-10:]
 
 
 # ---------------------------------------------------------------------------
@@ -496,6 +639,38 @@ def compute_state_checksum(content: str) -> str:
     return hashlib.sha256(content.encode("utf-8")).hexdigest()
 
 
+# Flushes file data (and size) without forcing unrelated metadata.
+_fdatasync = getattr(os, "fdatasync", os.fsync)
+
+# Below this size a plain read beats the mmap setup cost.
+_MMAP_MIN_SIZE = 64 * 1024
+
+
+def compute_file_checksum(path: Path) -> str:
+    """SHA-256 hex digest of a file's bytes.
+
+    Large files are memory-mapped and hashed in place, avoiding a full copy
+    into a Python ``bytes`` object.
+    """
+    with _file_buffer(path) as buf:
+        return hashlib.sha256(buf).hexdigest()
+
+
+@contextmanager
+def _file_buffer(path: str | Path) -> Iterator[bytes | mmap.mmap]:
+    """Yield a file's contents: ``bytes`` if small, else a read-only mmap.
+
+    The mmap is only valid inside the ``with`` block.
+    """
+    with open(path, "rb") as fh:
+        size = os.fstat(fh.fileno()).st_size
+        if size < _MMAP_MIN_SIZE:
+            yield fh.read()
+            return
+        with mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            yield mm
+
+
 def write_state(
     doc: StateDocument,
     state_path: Path,
@@ -518,21 +693,39 @@ def write_state(
     if create_backup and state_path.exists():
         backup_state(state_path, backup_dir)
 
-    content = render_state(doc)
-    checksum = compute_state_checksum(content)
+    data = render_state(doc).encode("utf-8")
+    checksum = hashlib.sha256(data).hexdigest()
 
     # Atomic write: write to .tmp then rename
     tmp_path = state_path.with_suffix(".tmp")
-    tmp_path.write_text(content, encoding="utf-8")
-    tmp_path.replace(state_path)
+    _write_synced(tmp_path, data)
+    os.replace(tmp_path, state_path)
 
     # Write checksum companion
-    hash_path = state_path.with_suffix(".md.hash")
-    hash_path.write_text(checksum + "\n", encoding="utf-8")
+    _write_synced(
+        state_path.with_suffix(".md.hash"), f"{checksum}\n".encode("ascii")
+    )
 
     return state_path, checksum
 
 
+def write_all(fd: int, data: bytes) -> None:
+    """``os.write`` until all of *data* is written (writes may be partial)."""
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _write_synced(path: Path, data: bytes) -> None:
+    """Create or truncate *path*, write *data* and fdatasync it."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        write_all(fd, data)
+        _fdatasync(fd)
+    finally:
+        os.close(fd)
+
+
 # ---------------------------------------------------------------------------
 # Verify
 # ---------------------------------------------------------------------------
@@ -554,29 +747,51 @@ def verify_state(state_path: Path) -> VerifyResult:
     Returns:
         VerifyResult with ok=True if all checks pass.
     """
-    errors: list[str] = []
-    warnings: list[str] = []
-
     # Check 1: file exists
     if not state_path.exists():
         return VerifyResult(ok=False, errors=["STATE.md not found"])
 
-    # Check 2: parse
+    # Check 2: parse (one read feeds both the parse and the checksum)
     try:
-        doc = parse_state(state_path)
+        with _file_buffer(state_path) as buf:
+            actual, doc = _parse_bytes_cached(buf)
     except Exception as exc:
         return VerifyResult(ok=False, errors=[f"Parse error: {exc}"])
 
     # Check 3: checksum
+    return verify_document(doc, actual, read_expected_checksum(state_path))
+
+
+def read_expected_checksum(state_path: Path) -> str | None:
+    """Return the checksum stored in the ``.md.hash`` companion, if any."""
     hash_path = state_path.with_suffix(".md.hash")
-    if hash_path.exists():
-        expected = hash_path.read_text(encoding="utf-8").strip()
-        actual = compute_state_checksum(state_path.read_text(encoding="utf-8"))
-        if actual != expected:
-            errors.append(
-                f"Checksum mismatch: expected {expected[:12]}... "
-                f"got {actual[:12]}..."
-            )
+    try:
+        return hash_path.read_text(encoding="utf-8").strip()
+    except FileNotFoundError:
+        return None
+
+
+def verify_document(
+    doc: StateDocument,
+    actual_checksum: str | None = None,
+    expected_checksum: str | None = None,
+) -> VerifyResult:
+    """Run the :func:`verify_state` checks on an already-parsed document.
+
+    The checksum check runs only when both checksums are given.
+    """
+    errors: list[str] = []
+    warnings: list[str] = []
+
+    if (
+        actual_checksum is not None
+        and expected_checksum is not None
+        and actual_checksum != expected_checksum
+    ):
+        errors.append(
+            f"Checksum mismatch: expected {expected_checksum[:12]}... "
+            f"got {actual_checksum[:12]}..."
+        )
 
     # Check 4: frontmatter
     required_fm = {"version", "last_updated", "owner", "project"}
@@ -642,28 +857,19 @@ def rebuild_state(
 
     doc = initial_doc
 
-    # Collect all report files
-    report_files: list[Path] = []
-    if inbox_dir.exists():
-        for json_file in inbox_dir.rglob("*.json"):
-            name = json_file.name
-            # Include both processed and unprocessed reports
-            if "_self_report" in name:
-                continue
-            if "example" in str(json_file):
-                continue
-            if name.endswith(".hash"):
-                continue
-            report_files.append(json_file)
-
-    # Sort by filename (which starts with timestamp)
-    report_files.sort(key=lambda p: p.name)
-
-    count = 0
-    for report_path in report_files:
-        try:
-            data = json.loads(report_path.read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError):
+    # Collect all report files, sorted by filename (which starts with
+    # timestamp).
+    report_files = sorted(_iter_reports(inbox_dir))
+
+    agent_index = _row_index(doc.agents, "Agent")
+    team_index = _row_index(doc.teams, "Team")
+    count = completed = failed = tokens = 0
+    # Rounded after every report, exactly as the running total always was.
+    cost_eur = doc.system_metrics.get("total_cost_eur", 0.0)
+    for (_, _, team_name), data in zip(
+        report_files, _load_reports([path for _, path, _ in report_files])
+    ):
+        if data is None:
             continue
 
         agent = data.get("agent", "unknown")
@@ -681,49 +887,48 @@ def rebuild_state(
                 "Last Task": task_id,
                 "Health": "healthy" if status == "success" else "degraded",
             },
+            index=agent_index,
         )
 
         # Update team status from inbox path
-        try:
-            rel = report_path.relative_to(inbox_dir)
-            parts = rel.parts
-            if len(parts) >= 1:
-                team_name = parts[0]
-                _upsert_row(
-                    doc.teams,
-                    key_col="Team",
-                    key_val=team_name,
-                    updates={
-                        "Last Report": timestamp,
-                        "Status": "idle",
-                    },
-                )
-        except ValueError:
-            pass
+        _upsert_row(
+            doc.teams,
+            key_col="Team",
+            key_val=team_name,
+            updates={
+                "Last Report": timestamp,
+                "Status": "idle",
+            },
+            index=team_index,
+        )
 
         # Update metrics
         metrics = data.get("metrics", {})
-        cost = metrics.get("cost_eur", 0)
         if status == "success":
-            doc.system_metrics["total_tasks_completed"] = (
-                doc.system_metrics.get("total_tasks_completed", 0) + 1
-            )
+            completed += 1
         else:
-            doc.system_metrics["total_tasks_failed"] = (
-                doc.system_metrics.get("total_tasks_failed", 0) + 1
-            )
-        doc.system_metrics["total_cost_eur"] = round(
-            doc.system_metrics.get("total_cost_eur", 0.0) + cost, 6
-        )
-        tokens_in = metrics.get("tokens_in", 0)
-        tokens_out = metrics.get("tokens_out", 0)
-        doc.system_metrics["total_tokens_consumed"] = (
-            doc.system_metrics.get("total_tokens_consumed", 0)
-            + tokens_in + tokens_out
-        )
+            failed += 1
+        cost_eur = round(cost_eur + metrics.get("cost_eur", 0), 6)
+        tokens += metrics.get("tokens_in", 0) + metrics.get("tokens_out", 0)
 
         count += 1
 
+    # Fold the totals into the metrics once, after the replay.
+    metrics_out = doc.system_metrics
+    if completed:
+        metrics_out["total_tasks_completed"] = (
+            metrics_out.get("total_tasks_completed", 0) + completed
+        )
+    if failed:
+        metrics_out["total_tasks_failed"] = (
+            metrics_out.get("total_tasks_failed", 0) + failed
+        )
+    if count:
+        metrics_out["total_cost_eur"] = cost_eur
+        metrics_out["total_tokens_consumed"] = (
+            metrics_out.get("total_tokens_consumed", 0) + tokens
+        )
+
     # Final timestamp
     doc.last_updated = datetime.now(timezone.utc).isoformat()
     doc.system_metrics["cycle_timestamp"] = doc.last_updated
@@ -735,34 +940,121 @@ def rebuild_state(
     return doc, count
 
 
+def _iter_reports(inbox_dir: Path) -> Iterator[tuple[str, str, str]]:
+    """Yield ``(name, path, team)`` for every report JSON under *inbox_dir*.
+
+    Both processed and unprocessed reports are included; self-reports,
+    ``.hash`` companions and anything with ``example`` in its path are
+    skipped.  *team* is the first path component below *inbox_dir*.  Walks
+    with ``os.scandir`` so file types come from the directory listing
+    instead of a ``Path`` object plus ``stat`` per entry.
+    """
+    root = os.fspath(inbox_dir)
+    try:
+        top = os.scandir(root)
+    except (FileNotFoundError, NotADirectoryError):
+        return
+    stack: list[tuple[os.DirEntry[str], str]] = []
+    with top:
+        for entry in top:
+            stack.append((entry, entry.name))
+    while stack:
+        entry, team = stack.pop()
+        try:
+            # Like Path.rglob, never descend into symlinked directories
+            # (a link back up the tree would repeat every report).
+            if entry.is_dir(follow_symlinks=False):
+                with os.scandir(entry.path) as it:
+                    stack.extend((child, team) for child in it)
+                continue
+            if not entry.is_file(follow_symlinks=False):
+                continue
+        except OSError:
+            continue
+        name = entry.name
+        if (
+            not name.endswith(".json")
+            or "_self_report" in name
+            or "example" in entry.path
+        ):
+            continue
+        yield name, entry.path, team
+
+
+# Reports are read and parsed on a small thread pool (file reads release
+# the GIL); state is still mutated sequentially in report order.
+_REPORT_LOAD_WORKERS = 8
+
+
+def _load_reports(paths: list[str]) -> Iterator[Any]:
+    """Yield each report's parsed JSON (None if unreadable), in order."""
+    if len(paths) < 2:
+        yield from map(_load_report, paths)
+        return
+    with ThreadPoolExecutor(
+        max_workers=min(_REPORT_LOAD_WORKERS, len(paths))
+    ) as pool:
+        yield from pool.map(_load_report, paths)
+
+
+def _load_report(path: str) -> Any:
+    """Parse one report file; None when it cannot be read or decoded."""
+    try:
+        with _file_buffer(path) as buf, memoryview(buf) as view:
+            return json_codec.loads(view)
+    except (OSError, ValueError):
+        return None
+
+
+def _row_index(
+    rows: list[dict[str, str]], key_col: str
+) -> dict[str, dict[str, str]]:
+    """Map each key_col value to its first row (rows without it skipped)."""
+    index: dict[str, dict[str, str]] = {}
+    for row in rows:
+        key = row.get(key_col)
+        if key is not None:
+            index.setdefault(key, row)
+    return index
+
+
 def _upsert_row(
     rows: list[dict[str, str]],
     key_col: str,
     key_val: str,
     updates: dict[str, str],
+    index: dict[str, dict[str, str]] | None = None,
 ) -> None:
-    """Update a row matching key_col==key_val, or append a new one."""
-    for row in rows:
-        if row.get(key_col) == key_val:
-            row.update(updates)
-            return
+    """Update a row matching key_col==key_val, or append a new one.
+
+    With an *index* from :func:`_row_index` the lookup is a dict hit
+    instead of a scan; appended rows are added to it.
+    """
+    if index is None:
+        index = _row_index(rows, key_col)
+    row = index.get(key_val)
+    if row is not None:
+        row.update(updates)
+        return
     new_row = {key_col: key_val, **updates}
     rows.append(new_row)
+    index[key_val] = new_row
 
 
 def _make_initial_state() -> StateDocument:
     """Create a blank StateDocument with default structure."""
+    now = datetime.now(timezone.utc).isoformat()
     return StateDocument(
         frontmatter={
             "version": "1.0.0",
-            "last_updated": datetime.now(timezone.utc).strftime("%Y-%m-%d"),
+            "last_updated": now[:10],
             "owner": "platform-team",
             "project": "ProjectMultiAgentAI",
             "priority": "HIGHEST — Single Source of Truth",
         },
-        last_updated=datetime.now(timezone.utc).isoformat(),
+        last_updated=now,
         system_metrics={
-            "cycle_timestamp": datetime.now(timezone.utc).isoformat(),
+            "cycle_timestamp": now,
             "total_tasks_completed": 0,
             "total_tasks_failed": 0,
             "total_cost_eur": 0.0,
@@ -18,6 +18,15 @@ _SECTION_KEY: dict[str, str] = {
     "candidate_changes": "Change ID",
 }
 
+# Section name → StateDocument attribute holding its rows.
+_SECTION_ATTR: dict[str, str] = {
+    "team_status": "teams",
+    "agent_status": "agents",
+    "active_locks": "active_locks",
+    "pending_directives": "pending_directives",
+    "candidate_changes": "candidate_changes",
+}
+
 VALID_SECTIONS = frozenset(list(_SECTION_KEY.keys()) + ["system_metrics"])
 
 
@@ -41,6 +50,8 @@ class StateValidator:
         """
         errors: list[str] = []
         warnings: list[str] = []
+        # Section → key value → row, built the first time a section is hit.
+        indexes: dict[str, dict[str, dict[str, str]]] = {}
 
         if not proposed_changes:
             errors.append("No changes provided")
@@ -80,7 +91,7 @@ class StateValidator:
 
             # --- Table sections ---
             self._validate_table_row(
-                current_state, change, prefix, warnings
+                current_state, change, prefix, warnings, indexes
             )
 
         return ValidationResult(
@@ -114,17 +125,24 @@ class StateValidator:
         change: StateChangeItem,
         prefix: str,
         warnings: list[str],
+        indexes: dict[str, dict[str, dict[str, str]]],
     ) -> None:
-        """Warn if table row's current value does not match old_value."""
-        rows = _get_section_rows(state, change.section)
-        if rows is None:
-            return
+        """Warn if table row's current value does not match old_value.
 
+        *indexes* caches each section's key → row map across the changes
+        of one :meth:`validate_change` call.
+        """
         key_col = _SECTION_KEY.get(change.section)
         if key_col is None or not change.field:
             return
 
-        target_row = _find_row(rows, key_col, change.field)
+        index = indexes.get(change.section)
+        if index is None:
+            index = indexes[change.section] = _index_rows(
+                getattr(state, _SECTION_ATTR[change.section]), key_col
+            )
+
+        target_row = index.get(change.field)
         if target_row is None:
             return  # New row — no current value to compare.
 
@@ -136,25 +154,13 @@ class StateValidator:
             )
 
 
-def _get_section_rows(
-    doc: StateDocument, section: str
-) -> list[dict[str, str]] | None:
-    """Return the list of row dicts for the given table section."""
-    mapping: dict[str, list[dict[str, str]]] = {
-        "team_status": doc.teams,
-        "agent_status": doc.agents,
-        "active_locks": doc.active_locks,
-        "pending_directives": doc.pending_directives,
-        "candidate_changes": doc.candidate_changes,
-    }
-    return mapping.get(section)
-
-
-def _find_row(
-    rows: list[dict[str, str]], key_col: str, key_val: str
-) -> dict[str, str] | None:
-    """Find a row by key column value."""
+def _index_rows(
+    rows: list[dict[str, str]], key_col: str
+) -> dict[str, dict[str, str]]:
+    """Map each key column value to its first row."""
+    index: dict[str, dict[str, str]] = {}
     for row in rows:
-        if row.get(key_col) == key_val:
-            return row
-    return None
+        key = row.get(key_col)
+        if key is not None:
+            index.setdefault(key, row)
+    return index
@@ -89,13 +89,15 @@ priority: "HIGHEST — Single Source of Truth"
 |---|---|---|---|---|
 | 2026-02-24T12:00:00Z | system | all | — | initial state |
 """
+# Encoded once; fixtures write these bytes instead of re-encoding per test.
+SAMPLE_STATE_BYTES = SAMPLE_STATE.encode("utf-8")
 
 
 @pytest.fixture()
 def state_file(tmp_path: Path) -> Path:
     """Write sample STATE.md to a temp directory."""
     p = tmp_path / "STATE.md"
-    p.write_text(SAMPLE_STATE, encoding="utf-8")
+    p.write_bytes(SAMPLE_STATE_BYTES)
     return p
 
 
@@ -104,7 +106,7 @@ def orchestrator_dir(tmp_path: Path) -> Path:
     """Create a temp orchestrator directory with STATE.md and all supporting files."""
     orch = tmp_path / "Orchestrator"
     orch.mkdir()
-    (orch / "STATE.md").write_text(SAMPLE_STATE, encoding="utf-8")
+    (orch / "STATE.md").write_bytes(SAMPLE_STATE_BYTES)
     (orch / ".backup").mkdir()
     (orch / "ops" / "logs").mkdir(parents=True)
     (orch / "HEALTH.md").write_text("# Health Log\n", encoding="utf-8")
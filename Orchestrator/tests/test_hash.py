@@ -3,44 +3,105 @@
 from __future__ import annotations
 
 import hashlib
-import json
+import os
+import threading
 from pathlib import Path
+from typing import Any
+from unittest.mock import MagicMock
 
 import pytest
 
+from Orchestrator import json_codec
 from Orchestrator.hash_manager import HashManager
 
 
+def _read_entries(log_path: Path) -> list[dict[str, Any]]:
+    """Parse every JSONL entry in the audit log at *log_path*."""
+    return [json_codec.loads(ln) for ln in log_path.read_bytes().splitlines()]
+
+
+@pytest.fixture(scope="module")
+def hm(tmp_path_factory: pytest.TempPathFactory) -> HashManager:
+    """One manager shared by the compute-only tests (never logs)."""
+    return HashManager(tmp_path_factory.mktemp("hash") / "audit.log")
+
+
 class TestComputeHash:
-    def test_deterministic(self, tmp_path: Path) -> None:
-        hm = HashManager(tmp_path / "audit.log")
+    def test_deterministic(self, hm: HashManager) -> None:
         h1 = hm.compute_hash("hello world")
         h2 = hm.compute_hash("hello world")
         assert h1 == h2
         assert len(h1) == 64  # SHA-256 hex
 
-    def test_differs_for_different_content(self, tmp_path: Path) -> None:
-        hm = HashManager(tmp_path / "audit.log")
+    def test_differs_for_different_content(self, hm: HashManager) -> None:
         h1 = hm.compute_hash("content A")
         h2 = hm.compute_hash("content B")
         assert h1 != h2
 
-    def test_known_sha256(self, tmp_path: Path) -> None:
-        hm = HashManager(tmp_path / "audit.log")
+    @pytest.mark.parametrize(
+        ("algorithm", "reference"),
+        [
+            ("sha256", hashlib.sha256),
+            ("blake2b", lambda data: hashlib.blake2b(data, digest_size=32)),
+        ],
+    )
+    def test_known_digest(
+        self, tmp_path: Path, algorithm: str, reference: Any
+    ) -> None:
+        hm = HashManager(tmp_path / "audit.log", algorithm=algorithm)
+        content = "test content"
+        expected = reference(content.encode("utf-8")).hexdigest()
+        assert len(expected) == 64
+        assert hm.compute_hash(content) == expected
+        assert hm.compute_hash_bytes(memoryview(content.encode())) == expected
+        assert hm.compute_hashes([content]) == [expected]
+        path = tmp_path / "content.txt"
+        path.write_bytes(content.encode("utf-8"))
+        assert hm.compute_hash_file(path) == expected
+
+    def test_default_is_sha256(self, hm: HashManager) -> None:
         content = "test content"
         expected = hashlib.sha256(content.encode("utf-8")).hexdigest()
         assert hm.compute_hash(content) == expected
 
-    def test_empty_string(self, tmp_path: Path) -> None:
-        hm = HashManager(tmp_path / "audit.log")
+    def test_unknown_algorithm_rejected(self, tmp_path: Path) -> None:
+        with pytest.raises(ValueError, match="md5"):
+            HashManager(tmp_path / "audit.log", algorithm="md5")
+
+    def test_empty_string(self, hm: HashManager) -> None:
         h = hm.compute_hash("")
         assert len(h) == 64
 
-    def test_unicode_content(self, tmp_path: Path) -> None:
-        hm = HashManager(tmp_path / "audit.log")
+    def test_unicode_content(self, hm: HashManager) -> None:
         h = hm.compute_hash("stato corrente del sistema — àèìòù")
         assert len(h) == 64
 
+    def test_bytes_matches_str(self, hm: HashManager) -> None:
+        text = "stato — àèìòù"
+        assert hm.compute_hash(text.encode("utf-8")) == hm.compute_hash(text)
+
+    def test_compute_hash_bytes_accepts_buffers(self, hm: HashManager) -> None:
+        data = "stato — àèìòù".encode("utf-8")
+        expected = hm.compute_hash(data)
+        assert hm.compute_hash_bytes(data) == expected
+        assert hm.compute_hash_bytes(memoryview(b"--" + data)[2:]) == expected
+
+    def test_compute_digest_is_raw_hash(self, hm: HashManager) -> None:
+        digest = hm.compute_digest("stato — àèìòù")
+        assert len(digest) == 32
+        assert digest.hex() == hm.compute_hash("stato — àèìòù")
+        assert hm.compute_digest(b"x") == hashlib.sha256(b"x").digest()
+
+    def test_compute_hashes_batch(self, hm: HashManager) -> None:
+        items: list[str | bytes] = ["a", b"b", ""]
+        assert hm.compute_hashes(items) == [hm.compute_hash(i) for i in items]
+
+    def test_compute_hash_file(self, tmp_path: Path) -> None:
+        hm = HashManager(tmp_path / "audit.log")
+        path = tmp_path / "STATE.md"
+        path.write_bytes(b"x" * 200_000)
+        assert hm.compute_hash_file(path) == hm.compute_hash(b"x" * 200_000)
+
 
 class TestLogHash:
     def test_creates_file(self, tmp_path: Path) -> None:
@@ -54,9 +115,7 @@ class TestLogHash:
         hm = HashManager(log_path)
         hm.log_hash("abc123", "update", "req-001")
 
-        lines = log_path.read_text(encoding="utf-8").strip().split("\n")
-        assert len(lines) == 1
-        entry = json.loads(lines[0])
+        (entry,) = _read_entries(log_path)
         assert entry["hash"] == "abc123"
         assert entry["operation"] == "update"
         assert entry["request_id"] == "req-001"
@@ -71,11 +130,8 @@ class TestLogHash:
         hm.log_hash("hash2", "op2", "req-2")
         hm.log_hash("hash3", "op3", "req-3")
 
-        lines = log_path.read_text(encoding="utf-8").strip().split("\n")
-        assert len(lines) == 3
-        assert json.loads(lines[0])["hash"] == "hash1"
-        assert json.loads(lines[1])["hash"] == "hash2"
-        assert json.loads(lines[2])["hash"] == "hash3"
+        hashes = [e["hash"] for e in _read_entries(log_path)]
+        assert hashes == ["hash1", "hash2", "hash3"]
 
     def test_with_error(self, tmp_path: Path) -> None:
         log_path = tmp_path / "audit.log"
@@ -85,7 +141,7 @@ class TestLogHash:
             status="error", error="validation failed"
         )
 
-        entry = json.loads(log_path.read_text(encoding="utf-8").strip())
+        (entry,) = _read_entries(log_path)
         assert entry["status"] == "error"
         assert entry["error"] == "validation failed"
         assert entry["hash"] == ""
@@ -100,5 +156,228 @@ class TestLogHash:
         log_path = tmp_path / "audit.log"
         hm = HashManager(log_path)
         hm.log_hash("h", "op", "r")
-        entry = json.loads(log_path.read_text(encoding="utf-8").strip())
+        (entry,) = _read_entries(log_path)
         assert entry["status"] == "ok"
+
+    def test_buffered_entries_written_in_one_append(
+        self, tmp_path: Path
+    ) -> None:
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path)
+        lines = hm.log_hash_buffered("h1", "op", "r1") + hm.log_hash_buffered(
+            "", "op", "r2", status="error", error="boom"
+        )
+        assert not log_path.exists()
+        hm.append_entries(lines)
+        assert log_path.read_bytes() == lines
+        entries = [json_codec.loads(line) for line in lines.splitlines()]
+        assert [e["request_id"] for e in entries] == ["r1", "r2"]
+        assert entries[1]["error"] == "boom"
+
+
+class TestPartialWrites:
+    @pytest.mark.parametrize("background", [False, True])
+    def test_short_writes_are_completed(
+        self,
+        tmp_path: Path,
+        monkeypatch: pytest.MonkeyPatch,
+        background: bool,
+    ) -> None:
+        real_write = os.write
+        monkeypatch.setattr(
+            os, "write", lambda fd, data: real_write(fd, data[:16])
+        )
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path, background=background)
+        with hm.batch():
+            for i in range(10):
+                hm.log_hash(f"h{i}", "op", f"req-{i}")
+        hm.close()
+        hashes = [e["hash"] for e in _read_entries(log_path)]
+        assert hashes == [f"h{i}" for i in range(10)]
+
+
+class TestBatch:
+    def test_defers_writes_until_exit(self, tmp_path: Path) -> None:
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path)
+        with hm.batch():
+            hm.log_hash("hash1", "op", "req-1")
+            hm.log_hash("hash2", "op", "req-2")
+            assert not log_path.exists()
+
+        hashes = [e["hash"] for e in _read_entries(log_path)]
+        assert hashes == ["hash1", "hash2"]
+
+    def test_single_fsync_per_batch(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fsync = MagicMock()
+        monkeypatch.setattr(os, "fsync", fsync)
+        hm = HashManager(tmp_path / "audit.log")
+        with hm.batch():
+            for i in range(5):
+                hm.log_hash(f"h{i}", "op", f"req-{i}")
+        fsync.assert_called_once()
+
+    def test_nested_batches_flush_once(self, tmp_path: Path) -> None:
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path)
+        with hm.batch():
+            with hm.batch():
+                hm.log_hash("inner", "op", "req-1")
+            assert not log_path.exists()
+            hm.log_hash("outer", "op", "req-2")
+        assert len(log_path.read_text(encoding="utf-8").splitlines()) == 2
+
+    def test_flushes_on_exception(self, tmp_path: Path) -> None:
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path)
+        with pytest.raises(RuntimeError):
+            with hm.batch():
+                hm.log_hash("h", "op", "req-1")
+                raise RuntimeError("boom")
+        assert log_path.exists()
+
+
+class TestPersistentFd:
+    def test_opens_audit_log_once(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        real_open = os.open
+        opener = MagicMock(side_effect=real_open)
+        monkeypatch.setattr(os, "open", opener)
+        hm = HashManager(tmp_path / "audit.log")
+        for i in range(3):
+            hm.log_hash(f"h{i}", "op", f"req-{i}")
+        hm.close()
+        assert opener.call_count == 1
+
+    def test_non_durable_skips_fsync_until_flush(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fsync = MagicMock()
+        monkeypatch.setattr(os, "fsync", fsync)
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path, durable=False)
+        hm.log_hash("h", "op", "req-1")
+        assert log_path.read_text(encoding="utf-8").count("\n") == 1
+        fsync.assert_not_called()
+        hm.flush(fsync=True)
+        fsync.assert_called_once()
+        hm.close()
+
+    def test_close_flushes_open_batch(self, tmp_path: Path) -> None:
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path)
+        with hm.batch():
+            hm.log_hash("h", "op", "req-1")
+            hm.close()
+            assert log_path.exists()
+
+
+class TestBackgroundWriter:
+    def test_writes_off_caller_thread(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        real_write = os.write
+        writers: list[threading.Thread] = []
+
+        def write(fd: int, data: bytes) -> int:
+            writers.append(threading.current_thread())
+            return real_write(fd, data)
+
+        monkeypatch.setattr(os, "write", write)
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path, background=True)
+        hm.log_hash("h", "op", "req-1")
+        hm.flush()
+        assert [e["hash"] for e in _read_entries(log_path)] == ["h"]
+        assert writers and threading.current_thread() not in writers
+        hm.close()
+
+    def test_close_drains_queue_in_order(self, tmp_path: Path) -> None:
+        log_path = tmp_path / "audit.log"
+        with HashManager(log_path, background=True) as hm:
+            for i in range(50):
+                hm.log_hash(f"h{i}", "op", f"req-{i}")
+        hashes = [e["hash"] for e in _read_entries(log_path)]
+        assert hashes == [f"h{i}" for i in range(50)]
+
+    def test_durable_entries_fsynced_by_writer(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fsync = MagicMock()
+        monkeypatch.setattr(os, "fsync", fsync)
+        hm = HashManager(tmp_path / "audit.log", background=True)
+        hm.log_hash("h", "op", "req-1")
+        hm.flush()
+        fsync.assert_called()
+        hm.close()
+
+    def test_write_error_raised_on_flush(self, tmp_path: Path) -> None:
+        blocker = tmp_path / "logs"
+        blocker.write_bytes(b"")
+        hm = HashManager(blocker / "audit.log", background=True)
+        hm.log_hash("h", "op", "req-1")
+        with pytest.raises(OSError):
+            hm.flush()
+        hm.close()
+
+
+class TestContextManager:
+    def test_exit_closes_fd(self, tmp_path: Path) -> None:
+        with HashManager(tmp_path / "audit.log") as hm:
+            hm.log_hash("h", "op")
+            assert hm._fd is not None
+        assert hm._fd is None
+
+
+class TestTimestamp:
+    def test_millisecond_iso_format(self, tmp_path: Path) -> None:
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path)
+        hm.log_hash("h", "op", "req-1")
+        (entry,) = _read_entries(log_path)
+        ts = entry["timestamp"]
+        # e.g. 2026-02-24T10:00:00.123+00:00
+        assert ts.endswith("+00:00")
+        assert len(ts.split(".")[1]) == len("123+00:00")
+
+    def test_reused_within_same_millisecond(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "Orchestrator.hash_manager.time.time", lambda: 1767225600.1234
+        )
+        hm = HashManager(tmp_path / "audit.log")
+        first = hm._timestamp()
+        assert hm._timestamp() is first
+        assert first == "2026-01-01T00:00:00.123+00:00"
+
+
+class TestEntryEncoding:
+    def test_template_matches_json_encoder(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr(
+            "Orchestrator.hash_manager.time.time", lambda: 1767225600.5
+        )
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path)
+        hm.log_hash("a" * 64, "update", "req-1")
+        expected = json_codec.dumps({
+            "timestamp": "2026-01-01T00:00:00.500+00:00",
+            "operation": "update",
+            "status": "ok",
+            "hash": "a" * 64,
+            "request_id": "req-1",
+        }) + b"\n"
+        assert log_path.read_bytes() == expected
+
+    def test_escaping_falls_back_to_json(self, tmp_path: Path) -> None:
+        log_path = tmp_path / "audit.log"
+        hm = HashManager(log_path)
+        hm.log_hash("h", "update", 'req "quoted"\n\\')
+        (entry,) = _read_entries(log_path)
+        assert entry["request_id"] == 'req "quoted"\n\\'
@@ -49,6 +49,13 @@ class TestRouteUnknownType:
             router.route({"type": ""})
         assert exc_info.value.task_type == ""
 
+    def test_route_by_type_unknown_raises(self) -> None:
+        router = IntentRouter()
+        with pytest.raises(UnknownTaskTypeError) as exc_info:
+            router.route_by_type("nonexistent")
+        assert exc_info.value.__cause__ is None
+        assert exc_info.value.task_type == "nonexistent"
+
 
 # -----------------------------------------------------------------------
 # Custom route registration
@@ -66,6 +73,18 @@ class TestRegisterCustomRoute:
         router.register_route("sheets", "sheets_v2_agent")
         assert router.route({"type": "sheets"}) == "sheets_v2_agent"
 
+    def test_override_after_earlier_route(self) -> None:
+        router = IntentRouter()
+        assert router.route({"type": "sheets"}) == "sheets_agent"
+        router.register_route("sheets", "sheets_v2_agent")
+        assert router.route({"type": "sheets"}) == "sheets_v2_agent"
+
+    def test_routing_tables_are_per_instance(self) -> None:
+        first = IntentRouter()
+        second = IntentRouter(routes={"sheets": "other_agent"})
+        assert first.route_by_type("sheets") == "sheets_agent"
+        assert second.route_by_type("sheets") == "other_agent"
+
     def test_init_with_custom_routes(self) -> None:
         router = IntentRouter(routes={"custom": "custom_agent"})
         # Custom route present
@@ -73,10 +92,27 @@ class TestRegisterCustomRoute:
         # Defaults still available
         assert router.route({"type": "sheets"}) == "sheets_agent"
 
-    def test_routes_property_returns_copy(self) -> None:
+    def test_routes_property_is_read_only(self) -> None:
         router = IntentRouter()
         routes = router.routes
-        routes["injected"] = "hacked_agent"
+        with pytest.raises(TypeError):
+            routes["injected"] = "hacked_agent"  # type: ignore[index]
         # Original must be unaffected
         with pytest.raises(UnknownTaskTypeError):
             router.route({"type": "injected"})
+
+    def test_routes_view_reflects_registration(self) -> None:
+        router = IntentRouter()
+        router.register_route("billing", "billing_agent")
+        routes = router.routes
+        router.register_route("audit", "audit_agent")
+        assert routes["billing"] == "billing_agent"
+        assert routes["audit"] == "audit_agent"
+
+    def test_register_does_not_leak_into_defaults(self) -> None:
+        first = IntentRouter()
+        first.register_route("billing", "billing_agent")
+        first.register_route("sheets", "sheets_v2_agent")
+        second = IntentRouter()
+        assert "billing" not in second.routes
+        assert second.route({"type": "sheets"}) == "sheets_agent"
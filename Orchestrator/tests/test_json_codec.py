@@ -0,0 +1,64 @@
+"""Tests for json_codec."""
+
+from __future__ import annotations
+
+import json
+
+import pytest
+
+from Orchestrator import json_codec
+
+_SAMPLE = {"status": "ok", "hash": "ab" * 32, "note": "àèìòù — ok", "n": [1, 2]}
+
+
+class TestDumps:
+    def test_round_trip(self) -> None:
+        assert json.loads(json_codec.dumps(_SAMPLE)) == _SAMPLE
+
+    def test_compact_utf8(self) -> None:
+        out = json_codec.dumps({"a": "é"})
+        assert out == '{"a":"é"}'.encode("utf-8")
+
+    def test_stdlib_fallback_matches(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fast = json_codec.dumps(_SAMPLE)
+        monkeypatch.setattr(json_codec, "_orjson_dumps", None)
+        assert json_codec.dumps(_SAMPLE) == fast
+
+
+class TestDumpsIndent:
+    def test_matches_stdlib(self) -> None:
+        assert json_codec.dumps_indent(_SAMPLE) == json.dumps(
+            _SAMPLE, indent=2, ensure_ascii=False
+        )
+
+    def test_stdlib_fallback_matches(
+        self, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fast = json_codec.dumps_indent(_SAMPLE)
+        monkeypatch.setattr(json_codec, "_orjson_dumps", None)
+        assert json_codec.dumps_indent(_SAMPLE) == fast
+
+
+class TestLoads:
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_accepts_buffers(
+        self, fast: bool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        if not fast:
+            monkeypatch.setattr(json_codec, "_orjson_loads", None)
+        raw = json.dumps(_SAMPLE).encode("utf-8")
+        assert json_codec.loads(raw) == _SAMPLE
+        assert json_codec.loads(memoryview(raw)) == _SAMPLE
+        assert json_codec.loads(raw.decode("utf-8")) == _SAMPLE
+
+    @pytest.mark.parametrize("fast", [True, False])
+    def test_invalid_input_raises_value_error(
+        self, fast: bool, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        if not fast:
+            monkeypatch.setattr(json_codec, "_orjson_loads", None)
+        for bad in (b"{not json", b'"\xff"'):
+            with pytest.raises(ValueError):
+                json_codec.loads(bad)
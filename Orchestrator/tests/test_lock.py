@@ -2,9 +2,11 @@
 
 from __future__ import annotations
 
+import os
 import threading
 import time
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -46,13 +48,42 @@ class TestStateLockBasic:
         assert lock.is_acquired
         lock.release_lock()
 
-    def test_lock_cleans_up_file(self, tmp_path: Path) -> None:
+    def test_lock_file_kept_after_release(self, tmp_path: Path) -> None:
         lock_path = tmp_path / ".state.lock"
         lock = StateLock(lock_path, timeout=5.0)
         lock.acquire_lock()
         lock.release_lock()
-        # Lock file should be deleted after release.
-        assert not lock_path.exists()
+        # The file stays (unlinking races with other lockers) and holds the PID.
+        assert lock_path.read_text() == str(os.getpid())
+        lock.close()
+
+    def test_reacquire_reuses_fd(self, tmp_path: Path) -> None:
+        lock = StateLock(tmp_path / ".state.lock", timeout=5.0)
+        with lock:
+            fd = lock._fd
+        with lock:
+            assert lock._fd == fd
+        lock.close()
+
+    def test_uncontended_acquire_never_sleeps(
+        self, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sleep = MagicMock()
+        monkeypatch.setattr("Orchestrator.state_lock.time.sleep", sleep)
+        lock = StateLock(tmp_path / ".state.lock", timeout=5.0)
+        for _ in range(3):
+            with lock:
+                assert lock.is_acquired
+        sleep.assert_not_called()
+        lock.close()
+
+    def test_timeout_when_held_elsewhere(self, tmp_path: Path) -> None:
+        lock_path = tmp_path / ".state.lock"
+        with StateLock(lock_path, timeout=5.0):
+            other = StateLock(lock_path, timeout=0.05)
+            with pytest.raises(StateLockError, match="timeout"):
+                other.acquire_lock()
+            assert not other.is_acquired
 
 
 class TestStateLockConcurrency:
@@ -60,18 +91,21 @@ class TestStateLockConcurrency:
         """Multiple threads contending for the same lock are serialized."""
         lock_path = tmp_path / ".state.lock"
         counter = [0]
+        # Separate instances (and fds): contention is on the OS lock.
+        locks = [StateLock(lock_path, timeout=15.0) for _ in range(5)]
+        barrier = threading.Barrier(len(locks))
 
-        def worker() -> None:
-            lock = StateLock(lock_path, timeout=15.0)
+        def worker(lock: StateLock) -> None:
+            barrier.wait()  # All threads race for the lock at once.
             lock.acquire_lock()
             try:
                 val = counter[0]
-                time.sleep(0.01)
+                time.sleep(0.001)
                 counter[0] = val + 1
             finally:
                 lock.release_lock()
 
-        threads = [threading.Thread(target=worker) for _ in range(5)]
+        threads = [threading.Thread(target=worker, args=(lk,)) for lk in locks]
         for t in threads:
             t.start()
         for t in threads:
@@ -80,6 +114,27 @@ class TestStateLockConcurrency:
         # Without lock serialization, counter would be < 5.
         assert counter[0] == 5
 
+    def test_shared_instance_serializes_threads(self, tmp_path: Path) -> None:
+        lock = StateLock(tmp_path / ".state.lock", timeout=15.0)
+        counter = [0]
+        barrier = threading.Barrier(5)
+
+        def worker() -> None:
+            barrier.wait()
+            with lock:
+                val = counter[0]
+                time.sleep(0.001)
+                counter[0] = val + 1
+
+        threads = [threading.Thread(target=worker) for _ in range(5)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join(timeout=30)
+
+        assert counter[0] == 5
+        assert not lock.is_acquired
+
     def test_context_manager_releases_on_exception(
         self, tmp_path: Path
     ) -> None:
@@ -0,0 +1,140 @@
+"""Tests for the Orchestrator command-line entry point."""
+
+from __future__ import annotations
+
+import socket
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from Orchestrator import json_codec
+from Orchestrator.__main__ import (
+    _daemon_running,
+    _query_daemon,
+    _recv_line,
+    _serve,
+    _verify,
+    _verify_frame,
+)
+from Orchestrator.orchestrator import Orchestrator
+
+
+def _start_daemon(
+    orch: Orchestrator, orch_dir: Path, sock: Path, max_requests: int
+) -> threading.Thread:
+    """Run _serve in a thread and wait until it accepts on *sock*.
+
+    The readiness probe is one extra request on top of *max_requests*.
+    """
+    server = threading.Thread(
+        target=_serve,
+        args=(orch, orch_dir, sock, max_requests + 1),
+        daemon=True,
+    )
+    server.start()
+    deadline = time.monotonic() + 5.0
+    while not _daemon_running(sock) and time.monotonic() < deadline:
+        time.sleep(0.01)
+    return server
+
+
+def _send_raw(sock: Path, frame: bytes) -> bytes:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as conn:
+        conn.settimeout(5.0)
+        conn.connect(str(sock))
+        conn.sendall(frame)
+        return _recv_line(conn)
+
+
+@pytest.fixture()
+def orch(orchestrator_dir: Path) -> Orchestrator:
+    return Orchestrator(orchestrator_dir=orchestrator_dir, lock_timeout=5.0)
+
+
+class TestWarmDaemon:
+    def test_query_served_by_daemon(
+        self, orch: Orchestrator, orchestrator_dir: Path
+    ) -> None:
+        sock = orchestrator_dir / "orch.sock"
+        server = _start_daemon(orch, orchestrator_dir, sock, 1)
+
+        report = _query_daemon(sock, orchestrator_dir)
+        server.join(timeout=5.0)
+
+        assert report == _verify(orch)
+        assert report["valid"]
+        assert report["health"] == "healthy"
+
+    def test_no_daemon_returns_none(self, tmp_path: Path) -> None:
+        assert _query_daemon(tmp_path / "missing.sock", tmp_path) is None
+
+    def test_other_dir_not_served(
+        self, orch: Orchestrator, orchestrator_dir: Path, tmp_path: Path
+    ) -> None:
+        sock = orchestrator_dir / "orch.sock"
+        server = _start_daemon(orch, orchestrator_dir, sock, 1)
+        assert _query_daemon(sock, tmp_path / "elsewhere") is None
+        server.join(timeout=5.0)
+        assert not server.is_alive()
+
+    def test_unknown_frame(
+        self, orch: Orchestrator, orchestrator_dir: Path
+    ) -> None:
+        sock = orchestrator_dir / "orch.sock"
+        server = _start_daemon(orch, orchestrator_dir, sock, 1)
+        reply = json_codec.loads(_send_raw(sock, b"HELLO\n"))
+        server.join(timeout=5.0)
+        assert reply == {"error": "unknown command"}
+
+    def test_silent_client_does_not_block_others(
+        self,
+        orch: Orchestrator,
+        orchestrator_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        monkeypatch.setattr("Orchestrator.__main__._SERVER_TIMEOUT", 0.2)
+        sock = orchestrator_dir / "orch.sock"
+        server = _start_daemon(orch, orchestrator_dir, sock, 2)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as silent:
+            silent.connect(str(sock))
+            silent.sendall(b"VERI")  # Never finishes the line.
+            report = _query_daemon(sock, orchestrator_dir)
+        server.join(timeout=5.0)
+        assert report is not None and report["valid"]
+        assert not server.is_alive()
+
+    def test_early_disconnect_keeps_serving(
+        self, orch: Orchestrator, orchestrator_dir: Path
+    ) -> None:
+        sock = orchestrator_dir / "orch.sock"
+        server = _start_daemon(orch, orchestrator_dir, sock, 2)
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as gone:
+            gone.connect(str(sock))
+            gone.sendall(_verify_frame(orchestrator_dir))
+        report = _query_daemon(sock, orchestrator_dir)
+        server.join(timeout=5.0)
+        assert report is not None and report["valid"]
+
+    def test_refuses_to_replace_live_daemon(
+        self, orch: Orchestrator, orchestrator_dir: Path
+    ) -> None:
+        sock = orchestrator_dir / "orch.sock"
+        server = _start_daemon(orch, orchestrator_dir, sock, 2)
+        with pytest.raises(RuntimeError, match="already serving"):
+            _serve(orch, orchestrator_dir, sock, 1)
+        report = _query_daemon(sock, orchestrator_dir)
+        server.join(timeout=5.0)
+        assert report is not None and report["valid"]
+
+    def test_replaces_stale_socket(
+        self, orch: Orchestrator, orchestrator_dir: Path
+    ) -> None:
+        sock = orchestrator_dir / "orch.sock"
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as dead:
+            dead.bind(str(sock))  # Bound but never listening.
+        server = _start_daemon(orch, orchestrator_dir, sock, 1)
+        report = _query_daemon(sock, orchestrator_dir)
+        server.join(timeout=5.0)
+        assert report is not None and report["valid"]
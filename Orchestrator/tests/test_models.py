@@ -0,0 +1,84 @@
+"""Tests for Orchestrator data models."""
+
+from __future__ import annotations
+
+import dataclasses
+import os
+import uuid
+from unittest.mock import patch
+
+import pytest
+
+from Orchestrator.models import (
+    DEGRADED,
+    DOWN,
+    HEALTHY,
+    HealthStatus,
+    IdPool,
+    StateChangeItem,
+    StateUpdateRequest,
+    ValidationResult,
+)
+
+
+def _item() -> StateChangeItem:
+    return StateChangeItem(
+        section="agents",
+        field="sheets-agent",
+        column="Status",
+        old_value="idle",
+        new_value="active",
+        reason="test",
+        triggered_by="controller",
+    )
+
+
+class TestModels:
+    def test_request_defaults(self) -> None:
+        first = StateUpdateRequest(origin="controller", changes=[_item()], reason="r")
+        second = StateUpdateRequest(origin="controller", changes=[], reason="r")
+        assert len(first.request_id) == 32
+        assert first.request_id != second.request_id
+        assert first.timestamp.tzinfo is not None
+
+    def test_frozen(self) -> None:
+        item = _item()
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            item.new_value = "idle"  # type: ignore[misc]
+
+    def test_slotted(self) -> None:
+        assert not hasattr(_item(), "__dict__")
+
+    def test_health_constants_are_members(self) -> None:
+        assert HEALTHY is HealthStatus("healthy")
+        assert DEGRADED is HealthStatus.DEGRADED
+        assert DOWN is HealthStatus.DOWN
+
+    def test_list_defaults_not_shared(self) -> None:
+        assert ValidationResult(valid=True).errors is not ValidationResult(valid=True).errors
+
+
+class TestIdPool:
+    def test_ids_are_valid_uuid4(self) -> None:
+        pool = IdPool(chunk=4)
+        for _ in range(10):
+            value = pool.next_hex()
+            parsed = uuid.UUID(hex=value)
+            assert parsed.version == 4
+            assert parsed.variant == uuid.RFC_4122
+            assert parsed.hex == value
+
+    def test_one_urandom_call_per_chunk(self) -> None:
+        pool = IdPool(chunk=8)
+        with patch("Orchestrator.models.os.urandom", wraps=os.urandom) as m:
+            ids = {pool.next_hex() for _ in range(16)}
+        assert len(ids) == 16
+        assert m.call_count == 2
+
+    def test_reset_discards_buffer(self) -> None:
+        pool = IdPool(chunk=8)
+        pool.next_hex()
+        pool.reset()
+        with patch("Orchestrator.models.os.urandom", return_value=bytes(128)) as m:
+            assert pool.next_hex() == uuid.UUID(bytes=bytes(16), version=4).hex
+        m.assert_called_once_with(128)
@@ -19,6 +19,23 @@ def _orch(orch_dir: Path) -> Orchestrator:
     return Orchestrator(orchestrator_dir=orch_dir, lock_timeout=5.0)
 
 
+@pytest.fixture()
+def orch(orchestrator_dir: Path) -> Orchestrator:
+    """Orchestrator over a fresh copy of the sample state."""
+    return _orch(orchestrator_dir)
+
+
+@pytest.fixture()
+def orch_without_state(tmp_path: Path) -> Orchestrator:
+    """Orchestrator whose directory has every file except STATE.md."""
+    orch_dir = tmp_path / "Orchestrator"
+    (orch_dir / ".backup").mkdir(parents=True)
+    (orch_dir / "ops" / "logs").mkdir(parents=True)
+    for name in ("HEALTH.md", "CHANGELOG.md", "MISTAKE.md"):
+        (orch_dir / name).write_bytes(b"")
+    return _orch(orch_dir)
+
+
 def _valid_request() -> StateUpdateRequest:
     return StateUpdateRequest(
         origin="controller",
@@ -43,14 +60,12 @@ def _valid_request() -> StateUpdateRequest:
 
 
 class TestHandleStateUpdate:
-    def test_controller_accepted(self, orchestrator_dir: Path) -> None:
-        orch = _orch(orchestrator_dir)
+    def test_controller_accepted(self, orch: Orchestrator) -> None:
         result = orch.handle_state_update(_valid_request())
         assert result.success
         assert len(result.state_hash) == 64
 
-    def test_unauthorized_rejected(self, orchestrator_dir: Path) -> None:
-        orch = _orch(orchestrator_dir)
+    def test_unauthorized_rejected(self, orch: Orchestrator) -> None:
         request = StateUpdateRequest(
             origin="rogue-agent",
             reason="Hack",
@@ -70,8 +85,7 @@ class TestHandleStateUpdate:
             orch.handle_state_update(request)
         assert exc_info.value.origin == "rogue-agent"
 
-    def test_empty_origin_rejected(self, orchestrator_dir: Path) -> None:
-        orch = _orch(orchestrator_dir)
+    def test_empty_origin_rejected(self, orch: Orchestrator) -> None:
         request = StateUpdateRequest(
             origin="",
             reason="test",
@@ -90,8 +104,7 @@ class TestHandleStateUpdate:
         with pytest.raises(UnauthorizedAccessError):
             orch.handle_state_update(request)
 
-    def test_agent_origin_rejected(self, orchestrator_dir: Path) -> None:
-        orch = _orch(orchestrator_dir)
+    def test_agent_origin_rejected(self, orch: Orchestrator) -> None:
         request = StateUpdateRequest(
             origin="sheets-agent",
             reason="Direct write attempt",
@@ -111,9 +124,8 @@ class TestHandleStateUpdate:
             orch.handle_state_update(request)
 
     def test_validation_error_returns_failure(
-        self, orchestrator_dir: Path
+        self, orch: Orchestrator
     ) -> None:
-        orch = _orch(orchestrator_dir)
         request = StateUpdateRequest(
             origin="controller",
             reason="bad",
@@ -122,6 +134,30 @@ class TestHandleStateUpdate:
         result = orch.handle_state_update(request)
         assert not result.success
 
+    def test_audit_trail_written_before_lock_release(
+        self,
+        orch: Orchestrator,
+        orchestrator_dir: Path,
+        monkeypatch: pytest.MonkeyPatch,
+    ) -> None:
+        audit = orchestrator_dir / "ops" / "logs" / "audit.log"
+        changelog = orchestrator_dir / "CHANGELOG.md"
+        before = changelog.read_bytes()
+        lock = orch._sm._lock
+        real_release = lock.release_lock
+        seen: list[tuple[bytes, bytes]] = []
+
+        def release_lock() -> None:
+            seen.append((audit.read_bytes(), changelog.read_bytes()))
+            real_release()
+
+        monkeypatch.setattr(lock, "release_lock", release_lock)
+        result = orch.handle_state_update(_valid_request())
+        assert result.success
+        [(audit_at_release, changelog_at_release)] = seen
+        assert result.state_hash.encode() in audit_at_release
+        assert changelog_at_release != before
+
 
 # -----------------------------------------------------------------------
 # verify_state_integrity
@@ -129,22 +165,12 @@ class TestHandleStateUpdate:
 
 
 class TestVerifyStateIntegrity:
-    def test_valid_state(self, orchestrator_dir: Path) -> None:
-        orch = _orch(orchestrator_dir)
+    def test_valid_state(self, orch: Orchestrator) -> None:
         result = orch.verify_state_integrity()
         assert result.valid  # No hash file → no checksum check.
 
-    def test_missing_state(self, tmp_path: Path) -> None:
-        orch_dir = tmp_path / "Orchestrator"
-        orch_dir.mkdir()
-        (orch_dir / ".backup").mkdir()
-        (orch_dir / "ops" / "logs").mkdir(parents=True)
-        (orch_dir / "HEALTH.md").write_text("", encoding="utf-8")
-        (orch_dir / "CHANGELOG.md").write_text("", encoding="utf-8")
-        (orch_dir / "MISTAKE.md").write_text("", encoding="utf-8")
-
-        orch = _orch(orch_dir)
-        result = orch.verify_state_integrity()
+    def test_missing_state(self, orch_without_state: Orchestrator) -> None:
+        result = orch_without_state.verify_state_integrity()
         assert not result.valid
 
 
@@ -154,22 +180,12 @@ class TestVerifyStateIntegrity:
 
 
 class TestHealthCheck:
-    def test_healthy(self, orchestrator_dir: Path) -> None:
-        orch = _orch(orchestrator_dir)
+    def test_healthy(self, orch: Orchestrator) -> None:
         health = orch.health_check()
         assert health.status == HealthStatus.HEALTHY
 
-    def test_down_when_missing(self, tmp_path: Path) -> None:
-        orch_dir = tmp_path / "Orchestrator"
-        orch_dir.mkdir()
-        (orch_dir / ".backup").mkdir()
-        (orch_dir / "ops" / "logs").mkdir(parents=True)
-        (orch_dir / "HEALTH.md").write_text("", encoding="utf-8")
-        (orch_dir / "CHANGELOG.md").write_text("", encoding="utf-8")
-        (orch_dir / "MISTAKE.md").write_text("", encoding="utf-8")
-
-        orch = _orch(orch_dir)
-        health = orch.health_check()
+    def test_down_when_missing(self, orch_without_state: Orchestrator) -> None:
+        health = orch_without_state.health_check()
         assert health.status == HealthStatus.DOWN
 
 
@@ -2,8 +2,13 @@
 
 from __future__ import annotations
 
+import dataclasses
 import json
+import os
+import tempfile
+from datetime import datetime
 from pathlib import Path
+from unittest.mock import MagicMock
 
 import pytest
 
@@ -12,11 +17,17 @@ from Orchestrator.models import (
     StateChangeItem,
     StateUpdateRequest,
 )
-from Orchestrator.state_manager import StateManager
+from Orchestrator.state_manager import (
+    StateManager,
+    _stat_key,
+    _to_state_changes,
+)
 from Orchestrator.state_processor import compute_state_checksum, parse_state
 
 
-def _make_manager(orch_dir: Path, timeout: float = 5.0) -> StateManager:
+def _make_manager(
+    orch_dir: Path, timeout: float = 5.0, durable: bool = True
+) -> StateManager:
     return StateManager(
         state_path=orch_dir / "STATE.md",
         backup_dir=orch_dir / ".backup",
@@ -26,6 +37,7 @@ def _make_manager(orch_dir: Path, timeout: float = 5.0) -> StateManager:
         mistake_path=orch_dir / "MISTAKE.md",
         audit_log_path=orch_dir / "ops" / "logs" / "audit.log",
         lock_timeout=timeout,
+        durable=durable,
     )
 
 
@@ -69,6 +81,92 @@ class TestLoadState:
         with pytest.raises(FileNotFoundError):
             sm.load_state()
 
+    def test_parse_cached_until_file_changes(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sm = _make_manager(orchestrator_dir)
+        sm.load_state()
+        parse = MagicMock(side_effect=AssertionError("re-parsed"))
+        monkeypatch.setattr("Orchestrator.state_manager.parse_state_from_bytes", parse)
+        doc = sm.load_state()
+        doc.agents[0]["Status"] = "mutated"  # copy; cache must be unaffected
+        assert sm.load_state().agents[0]["Status"] != "mutated"
+        monkeypatch.undo()
+
+        with open(orchestrator_dir / "STATE.md", "a", encoding="utf-8") as fh:
+            fh.write("\n")
+        assert sm.load_state().agents[0]["Status"] != "mutated"
+
+    def test_health_check_parses_once(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from Orchestrator import state_manager
+
+        parse = MagicMock(wraps=state_manager.parse_state_from_bytes)
+        monkeypatch.setattr("Orchestrator.state_manager.parse_state_from_bytes", parse)
+        sm = _make_manager(orchestrator_dir)
+        assert sm.health_check().status == HealthStatus.HEALTHY
+        assert parse.call_count == 1
+
+    def test_health_check_reuses_saved_doc(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sm = _make_manager(orchestrator_dir)
+        doc = sm.load_state()
+        state_hash = sm.save_state(doc)
+        monkeypatch.setattr(
+            "Orchestrator.state_manager.parse_state_from_bytes",
+            MagicMock(side_effect=AssertionError("re-parsed")),
+        )
+        health = sm.health_check()
+        assert health.status == HealthStatus.HEALTHY
+        assert health.state_hash == state_hash
+
+    def test_state_fd_reused_until_replaced(self, orchestrator_dir: Path) -> None:
+        sm = _make_manager(orchestrator_dir)
+        doc = sm.load_state()
+        fd = sm._state_fd
+        sm.load_state()
+        assert sm._state_fd == fd
+        doc.last_updated = "2026-03-01T00:00:00Z"
+        sm.save_state(doc)  # atomic rename -> new inode
+        assert sm.load_state().last_updated == "2026-03-01T00:00:00Z"
+        sm.close()
+        assert sm._state_fd is None
+
+    def test_replace_between_stat_and_open(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        state_path = orchestrator_dir / "STATE.md"
+        replacement = orchestrator_dir / "STATE.md.next"
+        replacement.write_bytes(
+            state_path.read_bytes().replace(b"idle", b"busy") + b"\n\n"
+        )
+        real_open = os.open
+
+        def racing_open(path: str, flags: int, *args: int) -> int:
+            if path == str(state_path) and replacement.exists():
+                os.replace(replacement, state_path)
+            return real_open(path, flags, *args)
+
+        monkeypatch.setattr("Orchestrator.state_manager.os.open", racing_open)
+        sm = _make_manager(orchestrator_dir)
+        assert sm.load_state() == parse_state(state_path)
+        assert sm._parse_cache is not None
+        assert sm._parse_cache[0] == _stat_key(os.stat(state_path))
+
+    def test_short_reads_are_completed(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        real_pread = os.pread
+        monkeypatch.setattr(
+            "Orchestrator.state_manager.os.pread",
+            lambda fd, n, offset: real_pread(fd, min(n, 100), offset),
+        )
+        sm = _make_manager(orchestrator_dir)
+        doc = sm.load_state()
+        assert doc == parse_state(orchestrator_dir / "STATE.md")
+
 
 class TestSaveState:
     def test_creates_file_and_hash(self, orchestrator_dir: Path) -> None:
@@ -81,6 +179,105 @@ class TestSaveState:
         assert hash_path.exists()
         assert hash_path.read_text(encoding="utf-8").strip() == state_hash
 
+    def test_fsyncs_parent_dir_after_rename(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        synced = MagicMock()
+        monkeypatch.setattr("Orchestrator.state_manager._fsync_dir", synced)
+        sm = _make_manager(orchestrator_dir)
+        sm.save_state(sm.load_state())
+        synced.assert_called_once_with(orchestrator_dir)
+
+    def test_non_durable_skips_all_syncs(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        fsync = MagicMock()
+        datasync = MagicMock()
+        monkeypatch.setattr("Orchestrator.state_manager.os.fsync", fsync)
+        monkeypatch.setattr("Orchestrator.state_manager._fdatasync", datasync)
+        sm = _make_manager(orchestrator_dir, durable=False)
+        assert sm.update_state(_make_request()).success
+        fsync.assert_not_called()
+        datasync.assert_not_called()
+        assert sm.load_state().agents[0]["Status"] == "active"
+
+    def test_background_audit_written_by_close(
+        self, orchestrator_dir: Path
+    ) -> None:
+        sm = StateManager(
+            state_path=orchestrator_dir / "STATE.md",
+            backup_dir=orchestrator_dir / ".backup",
+            lock_path=orchestrator_dir / ".state.lock",
+            health_path=orchestrator_dir / "HEALTH.md",
+            changelog_path=orchestrator_dir / "CHANGELOG.md",
+            mistake_path=orchestrator_dir / "MISTAKE.md",
+            audit_log_path=orchestrator_dir / "ops" / "logs" / "audit.log",
+            background_audit=True,
+        )
+        result = sm.update_state(_make_request())
+        sm.close()
+        audit = orchestrator_dir / "ops" / "logs" / "audit.log"
+        entry = json.loads(audit.read_text(encoding="utf-8"))
+        assert entry["hash"] == result.state_hash
+
+    @pytest.mark.skipif(
+        not hasattr(os, "O_TMPFILE"), reason="O_TMPFILE is Linux-only"
+    )
+    def test_unnamed_temp_file_leaves_no_siblings(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("Orchestrator.state_manager._O_TMPFILE", os.O_TMPFILE)
+        mkstemp = MagicMock(wraps=tempfile.mkstemp)
+        monkeypatch.setattr("Orchestrator.state_manager.tempfile.mkstemp", mkstemp)
+        before = set(orchestrator_dir.iterdir())
+        sm = _make_manager(orchestrator_dir)
+        doc = sm.load_state()
+        doc.agents[0]["Status"] = "error"
+        sm.save_state(doc)
+        after = set(orchestrator_dir.iterdir())
+        new = {p.name for p in after - before}
+        assert not any(n.endswith((".tmp", ".new")) for n in new)
+        assert sm.load_state().agents[0]["Status"] == "error"
+        # mkstemp is only the fallback for filesystems without O_TMPFILE.
+        if mkstemp.called:
+            pytest.skip("O_TMPFILE link-in unsupported here")
+
+    def test_mkstemp_fallback(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("Orchestrator.state_manager._O_TMPFILE", 0)
+        sm = _make_manager(orchestrator_dir)
+        doc = sm.load_state()
+        doc.agents[0]["Status"] = "error"
+        sm.save_state(doc)
+        assert sm.load_state().agents[0]["Status"] == "error"
+        assert not list(orchestrator_dir.glob("*.tmp"))
+
+    def test_cache_matches_file_after_adding_row(
+        self, orchestrator_dir: Path
+    ) -> None:
+        sm = _make_manager(orchestrator_dir)
+        doc = sm.load_state()
+        doc.agents.append({"Agent": "new-agent", "Status": "a|b"})
+        sm.save_state(doc)
+        assert sm.load_state() == parse_state(orchestrator_dir / "STATE.md")
+
+    def test_partial_writes_are_completed(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        real_write = os.write
+        monkeypatch.setattr(
+            "Orchestrator.state_manager.os.write",
+            lambda fd, data: real_write(fd, data[:100]),
+        )
+        sm = _make_manager(orchestrator_dir)
+        doc = sm.load_state()
+        doc.agents[0]["Status"] = "error"
+        state_hash = sm.save_state(doc)
+        raw = (orchestrator_dir / "STATE.md").read_bytes()
+        assert len(raw) > 100
+        assert compute_state_checksum(raw.decode("utf-8")) == state_hash
+
     def test_atomic_roundtrip(self, orchestrator_dir: Path) -> None:
         sm = _make_manager(orchestrator_dir)
         doc = sm.load_state()
@@ -118,6 +315,21 @@ class TestBackupRestore:
         restored = (orchestrator_dir / "STATE.md").read_text(encoding="utf-8")
         assert restored == original
 
+    def test_restore_keeps_backup_intact(self, orchestrator_dir: Path) -> None:
+        sm = _make_manager(orchestrator_dir)
+        backup_path = sm.backup_state()
+        original = backup_path.read_bytes()
+        doc = sm.load_state()
+        doc.agents[0]["Status"] = "error"
+        sm.save_state(doc)
+
+        sm.restore_state(backup_path)
+        assert sm.load_state().agents[0]["Status"] != "error"
+        # A later save must not write through into the restored backup.
+        sm.save_state(doc)
+        assert backup_path.read_bytes() == original
+        assert not list(orchestrator_dir.glob("*.restore"))
+
 
 # -----------------------------------------------------------------------
 # update_state — full sequence
@@ -125,6 +337,13 @@ class TestBackupRestore:
 
 
 class TestUpdateState:
+    def test_change_items_convert_field_for_field(self) -> None:
+        items = _make_request().changes
+        converted = _to_state_changes(list(items))
+        assert [dataclasses.asdict(c) for c in converted] == [
+            dataclasses.asdict(i) for i in items
+        ]
+
     def test_successful_update(self, orchestrator_dir: Path) -> None:
         sm = _make_manager(orchestrator_dir)
         result = sm.update_state(_make_request())
@@ -168,6 +387,24 @@ class TestUpdateState:
         assert "Agent activation" in changelog
         assert "state_update" in changelog
 
+    def test_entries_share_one_timestamp(self, orchestrator_dir: Path) -> None:
+        sm = _make_manager(orchestrator_dir)
+        sm.update_state(_make_request())
+
+        health = (orchestrator_dir / "HEALTH.md").read_text(encoding="utf-8")
+        ts = json.loads(health.strip().splitlines()[-1])["timestamp"]
+        changelog = (orchestrator_dir / "CHANGELOG.md").read_text(encoding="utf-8")
+        assert f"## [{ts}]" in changelog
+        audit = orchestrator_dir / "ops" / "logs" / "audit.log"
+        audit_ts = json.loads(audit.read_text(encoding="utf-8").splitlines()[-1])[
+            "timestamp"
+        ]
+        # The audit log keeps its millisecond format for the same instant.
+        at = datetime.fromisoformat(ts)
+        assert datetime.fromisoformat(audit_ts) == at.replace(
+            microsecond=at.microsecond // 1000 * 1000
+        )
+
     def test_multiple_changes(self, orchestrator_dir: Path) -> None:
         sm = _make_manager(orchestrator_dir)
         changes = [
@@ -306,6 +543,93 @@ class TestUpdateStateErrors:
         assert not result.success
         assert any("No changes" in e for e in result.errors)
 
+    def test_empty_changes_skip_backup_and_read(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sm = _make_manager(orchestrator_dir)
+        backup = MagicMock()
+        load = MagicMock()
+        monkeypatch.setattr(sm, "backup_state", backup)
+        monkeypatch.setattr(sm, "load_state", load)
+        result = sm.update_state(_make_request(changes=[]))
+        assert not result.success
+        backup.assert_not_called()
+        load.assert_not_called()
+        assert not sm._lock.is_acquired
+        mistake = (orchestrator_dir / "MISTAKE.md").read_text(encoding="utf-8")
+        assert "No changes provided" in mistake
+
+
+class TestAuditBatch:
+    def test_appends_per_update_one_sync_per_durable_batch(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        datasync = MagicMock()
+        monkeypatch.setattr("Orchestrator.state_manager._fdatasync", datasync)
+        sm = _make_manager(orchestrator_dir)
+        health = orchestrator_dir / "HEALTH.md"
+        before = health.read_bytes().count(b"\n")
+        with sm.durable_batch():
+            assert sm.update_state(_make_request()).success
+            assert sm.update_state(_make_request(changes=[])).success is False
+            # Written per update, before the lock dropped; not yet synced.
+            assert health.read_bytes().count(b"\n") == before + 2
+            datasync.assert_not_called()
+        # HEALTH.md, CHANGELOG.md and MISTAKE.md: one sync each.
+        assert datasync.call_count == 3
+        assert len({c.args[0] for c in datasync.call_args_list}) == 3
+
+    def test_audit_entries_written_per_update_synced_at_exit(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sm = _make_manager(orchestrator_dir)
+        flush = MagicMock(wraps=sm.hash_manager.flush)
+        monkeypatch.setattr(sm.hash_manager, "flush", flush)
+        audit = orchestrator_dir / "ops" / "logs" / "audit.log"
+        with sm.durable_batch():
+            assert sm.update_state(_make_request()).success
+            assert not sm.update_state(_make_request(changes=[])).success
+            lines = audit.read_bytes().splitlines()
+            assert [json.loads(ln)["status"] for ln in lines] == ["ok", "error"]
+            flush.assert_not_called()
+        flush.assert_called_once_with(fsync=True)
+
+    def test_flushed_per_update_outside_batch(
+        self, orchestrator_dir: Path
+    ) -> None:
+        sm = _make_manager(orchestrator_dir)
+        assert sm.update_state(_make_request()).success
+        lines = (orchestrator_dir / "HEALTH.md").read_text().splitlines()
+        assert json.loads(lines[-1])["status"] == "healthy"
+
+    def test_appends_use_fdatasync(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        datasync = MagicMock()
+        monkeypatch.setattr("Orchestrator.state_manager._fdatasync", datasync)
+        sm = _make_manager(orchestrator_dir)
+        assert sm.update_state(_make_request()).success
+        assert datasync.call_count == 2  # HEALTH.md + CHANGELOG.md
+
+    def test_append_fds_persist_until_rotation(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        sm = _make_manager(orchestrator_dir)
+        assert sm.update_state(_make_request()).success
+        opened = MagicMock(wraps=os.open)
+        monkeypatch.setattr("Orchestrator.state_manager.os.open", opened)
+        assert sm.update_state(_make_request()).success
+        health = orchestrator_dir / "HEALTH.md"
+        assert not any(c.args[0] == str(health) for c in opened.call_args_list)
+
+        health.rename(orchestrator_dir / "HEALTH.md.1")  # rotate
+        assert sm.update_state(_make_request()).success
+        assert any(c.args[0] == str(health) for c in opened.call_args_list)
+        lines = health.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["status"] == "healthy"
+        sm.close()
+
 
 # -----------------------------------------------------------------------
 # verify & health
@@ -327,6 +651,22 @@ class TestVerifyIntegrity:
         sm = _make_manager(tmp_path)
         result = sm.verify_integrity()
         assert not result.ok
+        assert result.errors == ["STATE.md not found"]
+
+    def test_shares_parse_with_health_check(
+        self, orchestrator_dir: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from Orchestrator import state_manager
+
+        parse = MagicMock(wraps=state_manager.parse_state_from_bytes)
+        monkeypatch.setattr("Orchestrator.state_manager.parse_state_from_bytes", parse)
+        sm = _make_manager(orchestrator_dir)
+        (orchestrator_dir / "STATE.md.hash").write_text("0" * 64, encoding="utf-8")
+        result = sm.verify_integrity()
+        assert not result.ok
+        assert any("Checksum mismatch" in e for e in result.errors)
+        assert sm.health_check().status == HealthStatus.DEGRADED
+        assert parse.call_count == 1
 
 
 class TestHealthCheck:
@@ -352,3 +692,25 @@ class TestHealthCheck:
         health = sm.health_check()
         assert health.status == HealthStatus.DEGRADED
         assert any("Checksum" in e for e in health.errors)
+
+    def test_unparsable_state_uses_fresh_companion_hash(
+        self, orchestrator_dir: Path
+    ) -> None:
+        sm = _make_manager(orchestrator_dir)
+        state_path = orchestrator_dir / "STATE.md"
+        hash_path = orchestrator_dir / "STATE.md.hash"
+        state_path.write_bytes(b"\xff\xfe not utf-8")
+        hash_path.write_text("c" * 64 + "\n", encoding="utf-8")
+        st = state_path.stat()
+        sm._hash_manager.compute_hash_file = MagicMock()  # type: ignore[method-assign]
+
+        os.utime(hash_path, ns=(st.st_atime_ns, st.st_mtime_ns + 1))
+        health = sm.health_check()
+        assert health.status == HealthStatus.DEGRADED
+        assert health.state_hash == "c" * 64
+        sm._hash_manager.compute_hash_file.assert_not_called()
+
+        # Stale companion: fall back to hashing the file itself.
+        os.utime(hash_path, ns=(st.st_atime_ns, st.st_mtime_ns - 10**9))
+        sm._hash_manager.compute_hash_file.return_value = "d" * 64
+        assert sm.health_check().state_hash == "d" * 64
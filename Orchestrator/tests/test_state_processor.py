@@ -1,21 +1,32 @@
 """Tests for Orchestrator.state_processor."""
 from __future__ import annotations
 
+import errno
+import hashlib
 import json
+from collections.abc import Iterator
 from pathlib import Path
 from typing import Any
+from unittest.mock import MagicMock
 
 import pytest
 
 from Orchestrator.state_processor import (
     StateChange,
     StateDocument,
+    _make_initial_state,
     apply_state_changes,
     backup_state,
+    compute_file_checksum,
     compute_state_checksum,
     parse_state,
+    parse_state_cache_clear,
+    parse_state_cached,
+    parse_state_from_bytes,
+    parse_state_text,
     rebuild_state,
     render_state,
+    verify_document,
     verify_state,
     write_state,
 )
@@ -106,13 +117,15 @@ priority: "HIGHEST — Single Source of Truth"
 |---|---|---|---|---|
 | 2026-02-24T12:00:00Z | system | all | — | initial state |
 """
+# Encoded once; fixtures write these bytes instead of re-encoding per test.
+SAMPLE_STATE_BYTES = SAMPLE_STATE.encode("utf-8")
 
 
 @pytest.fixture
 def state_file(tmp_path: Path) -> Path:
     """Write sample STATE.md to a temp directory."""
     p = tmp_path / "STATE.md"
-    p.write_text(SAMPLE_STATE, encoding="utf-8")
+    p.write_bytes(SAMPLE_STATE_BYTES)
     return p
 
 
@@ -158,6 +171,83 @@ class TestParseState:
         assert len(doc.change_history) == 1
         assert doc.change_history[0]["Changed By"] == "system"
 
+    def test_parse_from_bytes_matches_file(self, state_file: Path) -> None:
+        expected = parse_state(state_file)
+        assert parse_state_from_bytes(SAMPLE_STATE_BYTES) == expected
+        crlf = SAMPLE_STATE.replace("\n", "\r\n").encode("utf-8")
+        assert parse_state_from_bytes(crlf) == expected
+
+    def test_parse_large_file_via_mmap(self, tmp_path: Path) -> None:
+        padding = "> " + "x" * 100 + "\n"
+        text = SAMPLE_STATE.replace(
+            "## Stato Corrente", padding * 1000 + "## Stato Corrente"
+        )
+        path = tmp_path / "STATE.md"
+        path.write_text(text, encoding="utf-8")
+        assert path.stat().st_size > 64 * 1024
+        assert parse_state(path) == parse_state_text(text)
+        parse_state_cache_clear()
+        assert parse_state_cached(path) == parse_state_text(text)
+        assert verify_state(path).ok
+
+    def test_parse_tolerates_layout_variations(self) -> None:
+        text = SAMPLE_STATE.replace(
+            "### Timestamp Ultimo Aggiornamento\n```",
+            "### Timestamp Ultimo Aggiornamento  \n\n```",
+        ).replace(
+            "| sheets-team | idle | 0 | — | 0 |\n",
+            "| sheets-team | idle | 0 | — | 0 |\n\nnote between rows\n",
+        )
+        doc = parse_state_text(text)
+        assert doc.last_updated == "2026-02-24T12:00:00Z"
+        assert [t["Team"] for t in doc.teams] == ["sheets-team", "backend-team"]
+        assert doc.system_metrics["active_agents"] == 2
+
+    def test_parse_unterminated_blocks_are_ignored(self) -> None:
+        head, _, _ = SAMPLE_STATE.partition("### System Metrics")
+        text = head + "### System Metrics\n\n```json\n{\"a\": 1}\n"
+        doc = parse_state_text(text)
+        assert doc.system_metrics == {}
+        assert len(doc.agents) == 2
+
+
+class TestParseCache:
+    @pytest.fixture(autouse=True)
+    def _clear(self) -> Iterator[None]:
+        parse_state_cache_clear()
+        yield
+        parse_state_cache_clear()
+
+    def test_identical_content_parsed_once(
+        self, state_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from Orchestrator import state_processor
+
+        parse = MagicMock(wraps=state_processor.parse_state_text)
+        monkeypatch.setattr("Orchestrator.state_processor.parse_state_text", parse)
+        first = parse_state_cached(state_file)
+        first.agents[0]["Status"] = "mutated"
+        second = parse_state_cached(state_file)
+        assert parse.call_count == 1
+        assert second.agents[0]["Status"] == "idle"
+        assert verify_state(state_file).ok
+        assert parse.call_count == 1
+
+        state_file.write_text(SAMPLE_STATE.replace("idle", "busy"), encoding="utf-8")
+        assert parse_state_cached(state_file).agents[0]["Status"] == "busy"
+        assert parse.call_count == 2
+
+    def test_cache_is_bounded(
+        self, state_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        monkeypatch.setattr("Orchestrator.state_processor._PARSE_CACHE_MAX", 2)
+        for i in range(5):
+            state_file.write_text(SAMPLE_STATE + f"\n<!-- {i} -->\n", encoding="utf-8")
+            parse_state_cached(state_file)
+        from Orchestrator.state_processor import _PARSE_CACHE
+
+        assert len(_PARSE_CACHE) == 2
+
 
 # ---------------------------------------------------------------------------
 # Render round-trip
@@ -252,8 +342,31 @@ class TestApplyStateChanges:
             )
             for i in range(15)
         ]
+        history = doc.change_history
         apply_state_changes(doc, changes)
         assert len(doc.change_history) <= 10
+        assert doc.change_history is history
+        assert doc.change_history[-1]["New Value"] == "check-14"
+
+    def test_new_row_is_reused_within_batch(self, state_file: Path) -> None:
+        doc = parse_state(state_file)
+        changes = [
+            StateChange(
+                section="agent_status",
+                field="metrics-agent",
+                column=column,
+                old_value="—",
+                new_value=value,
+                reason="Agent registered",
+                triggered_by="ctrl-004",
+            )
+            for column, value in (("Status", "idle"), ("Health", "healthy"))
+        ]
+        apply_state_changes(doc, changes)
+        assert len(doc.agents) == 3
+        assert doc.agents[2] == {
+            "Agent": "metrics-agent", "Status": "idle", "Health": "healthy",
+        }
 
 
 # ---------------------------------------------------------------------------
@@ -273,6 +386,26 @@ class TestBackup:
             encoding="utf-8"
         )
 
+    def test_backup_is_hardlink_untouched_by_rewrite(
+        self, state_file: Path
+    ) -> None:
+        original = state_file.read_bytes()
+        backup_path = backup_state(state_file)
+        assert backup_path.stat().st_ino == state_file.stat().st_ino
+        write_state(parse_state(state_file), state_file, create_backup=False)
+        assert backup_path.read_bytes() == original
+
+    def test_backup_falls_back_to_copy(
+        self, state_file: Path, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        def refuse(src: Path, dst: Path) -> None:
+            raise OSError(errno.EXDEV, "cross-device link")
+
+        monkeypatch.setattr("Orchestrator.state_processor.os.link", refuse)
+        backup_path = backup_state(state_file)
+        assert backup_path.stat().st_ino != state_file.stat().st_ino
+        assert backup_path.read_bytes() == state_file.read_bytes()
+
     def test_cleanup_old_backups(self, state_file: Path) -> None:
         backup_dir = state_file.parent / "backups"
         backup_dir.mkdir()
@@ -307,6 +440,19 @@ class TestWriteState:
         assert (tmp_path / "STATE.md.hash").exists()
         assert len(checksum) == 64  # SHA-256 hex
 
+    def test_written_bytes_match_checksum(self, state_file: Path) -> None:
+        doc = parse_state(state_file)
+        doc.agents[0]["Status"] = "é-active"
+        _, checksum = write_state(doc, state_file, create_backup=False)
+        raw = state_file.read_bytes()
+        assert raw == render_state(doc).encode("utf-8")
+        assert hashlib.sha256(raw).hexdigest() == checksum
+        assert (
+            state_file.with_suffix(".md.hash").read_text(encoding="utf-8")
+            == checksum + "\n"
+        )
+        assert not state_file.with_suffix(".tmp").exists()
+
     def test_write_with_backup(self, state_file: Path) -> None:
         doc = parse_state(state_file)
         write_state(doc, state_file, create_backup=True)
@@ -347,6 +493,23 @@ class TestVerify:
         result = verify_state(state_file)
         assert result.ok  # No hash file = no checksum check
 
+    def test_verify_document_checksum(self, state_file: Path) -> None:
+        doc = parse_state(state_file)
+        assert verify_document(doc).ok
+        assert verify_document(doc, "a" * 64, "a" * 64).ok
+        result = verify_document(doc, "a" * 64, "b" * 64)
+        assert not result.ok
+        assert "Checksum mismatch" in result.errors[0]
+
+    @pytest.mark.parametrize("size", [0, 100, 200_000])
+    def test_file_checksum_matches_content(
+        self, tmp_path: Path, size: int
+    ) -> None:
+        content = "é" * size
+        path = tmp_path / "STATE.md"
+        path.write_text(content, encoding="utf-8")
+        assert compute_file_checksum(path) == compute_state_checksum(content)
+
 
 # ---------------------------------------------------------------------------
 # Rebuild
@@ -404,3 +567,56 @@ class TestRebuild:
         state_path = tmp_path / "STATE.md"
         doc, count = rebuild_state(inbox.parent, state_path)
         assert count == 0
+
+    def test_rebuild_skips_malformed_reports(self, tmp_path: Path) -> None:
+        team_dir = tmp_path / "inbox" / "sheets-team"
+        team_dir.mkdir(parents=True)
+        (team_dir / "20260224T100000Z_report.json").write_bytes(b"{not json")
+        (team_dir / "20260224T110000Z_report.json").write_bytes(b"\xff\xfe")
+        (team_dir / "20260224T120000Z_report.json").write_text(
+            '{"agent": "sheets-agent", "status": "success"}', encoding="utf-8"
+        )
+        doc, count = rebuild_state(tmp_path / "inbox", tmp_path / "STATE.md")
+        assert count == 1
+        assert [a["Agent"] for a in doc.agents] == ["sheets-agent"]
+
+    def test_rebuild_walks_nested_dirs(self, tmp_path: Path) -> None:
+        inbox = tmp_path / "inbox"
+        report = '{"agent": "%s", "status": "success"}'
+        for rel, agent in (
+            ("sheets-team/sheets-agent/2026T100000Z_report.json", "a1"),
+            ("docs-team/2026T110000Z_report.processed.json", "a2"),
+            ("docs-team/examples/2026T120000Z_report.json", "skip"),
+            ("docs-team/2026T130000Z_report.json.hash", "skip"),
+            ("docs-team/notes.txt", "skip"),
+        ):
+            path = inbox / rel
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(report % agent, encoding="utf-8")
+        doc, count = rebuild_state(inbox, tmp_path / "STATE.md")
+        assert count == 2
+        assert [a["Agent"] for a in doc.agents] == ["a1", "a2"]
+        assert [t["Team"] for t in doc.teams] == ["sheets-team", "docs-team"]
+
+    def test_rebuild_ignores_symlink_loops(self, tmp_path: Path) -> None:
+        inbox = tmp_path / "inbox"
+        team = inbox / "team-a"
+        team.mkdir(parents=True)
+        (team / "r1.json").write_text(
+            '{"agent": "a1", "status": "success",'
+            ' "metrics": {"tokens_in": 4, "tokens_out": 6}}',
+            encoding="utf-8",
+        )
+        (team / "loop").symlink_to("..", target_is_directory=True)
+        doc, count = rebuild_state(inbox, tmp_path / "STATE.md")
+        assert count == 1
+        assert doc.system_metrics["total_tokens_consumed"] == 10
+
+    def test_rebuild_missing_inbox(self, tmp_path: Path) -> None:
+        _, count = rebuild_state(tmp_path / "absent", tmp_path / "STATE.md")
+        assert count == 0
+
+    def test_initial_state_timestamps_agree(self) -> None:
+        doc = _make_initial_state()
+        assert doc.system_metrics["cycle_timestamp"] == doc.last_updated
+        assert doc.frontmatter["last_updated"] == doc.last_updated[:10]
@@ -287,3 +287,29 @@ class TestWarnings:
         result = validator.validate_change(sample_doc, changes)
         assert result.valid
         assert len(result.warnings) > 0
+
+    def test_batch_warnings_keep_change_order(
+        self, validator: StateValidator, sample_doc: StateDocument
+    ) -> None:
+        changes = [
+            StateChangeItem(
+                section=section,
+                field=field,
+                column="Status",
+                old_value="stale",
+                new_value="error",
+                reason="test",
+                triggered_by="test",
+            )
+            for section, field in (
+                ("agent_status", "sheets-agent"),
+                ("team_status", "sheets-team"),
+                ("agent_status", "sheets-agent"),
+                ("agent_status", "unknown-agent"),
+            )
+        ]
+        result = validator.validate_change(sample_doc, changes)
+        assert result.valid
+        assert [w.split(":")[0] for w in result.warnings] == [
+            "change[0]", "change[1]", "change[2]",
+        ]